@@ -0,0 +1,43 @@
+import random
+
+
+STAGES = [
+    "seed",
+    "soil",
+    "fertilizer",
+    "water",
+    "light",
+    "temperature",
+    "humidity",
+    "location",
+]
+ID_SPACE = 2**32
+SEED_RANGES = 10
+MAP_RANGES = 40
+
+
+def generate(scale: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    seeds: list[int] = []
+    for _ in range(SEED_RANGES * scale):
+        count = rng.randrange(10_000_000, 300_000_000)
+        seeds.extend((rng.randrange(0, ID_SPACE - count), count))
+
+    lines = [f"seeds: {' '.join(map(str, seeds))}"]
+    for source, destination in zip(STAGES, STAGES[1:]):
+        lines.extend(("", f"{source}-to-{destination} map:"))
+
+        # Cut the id space into intervals and shuffle where each one lands, which
+        # keeps every stage a bijection like the real almanacs
+        bounds = [0, *sorted(rng.sample(range(1, ID_SPACE), MAP_RANGES - 1)), ID_SPACE]
+        intervals = list(zip(bounds, bounds[1:]))
+        shuffled = intervals[:]
+        rng.shuffle(shuffled)
+
+        start = 0
+        for low, high in shuffled:
+            lines.append(f"{start} {low} {high - low}")
+            start += high - low
+
+    return "\n".join(lines) + "\n"
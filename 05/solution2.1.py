@@ -1,7 +1,15 @@
+import argparse
+import re
+from array import array
+from bisect import bisect_right
+from math import inf
 from pathlib import Path
+from typing import Optional, Sequence
 
+from aoc.cli import add_common_args, run
 
-input_file = Path("input")
+
+MAP_HEADER = re.compile(r"(?P<source>\w+)-to-(?P<destination>\w+) map:")
 
 
 class RangeMap(object):
@@ -20,6 +28,63 @@ class RangeMap(object):
         return str(self)
 
 
+class Stage(list):
+    """
+    The RangeMaps for one stage, plus sorted parallel arrays of them by source and by
+    destination so an id can be looked up either way with a bisect.
+    """
+
+    def __init__(self, source_category: str = "", destination_category: str = ""):
+        super().__init__()
+        self.source_category = source_category
+        self.destination_category = destination_category
+
+    def build(self) -> None:
+        by_source = sorted(self, key=lambda r: r.source.start)
+        self.source_starts = array("q", (r.source.start for r in by_source))
+        self.source_lengths = array("q", (len(r.source) for r in by_source))
+        self.source_offsets = array(
+            "q", (r.destination.start - r.source.start for r in by_source)
+        )
+
+        by_destination = sorted(self, key=lambda r: r.destination.start)
+        self.destination_starts = array(
+            "q", (r.destination.start for r in by_destination)
+        )
+        self.destination_lengths = array(
+            "q", (len(r.destination) for r in by_destination)
+        )
+        self.destination_offsets = array(
+            "q", (r.source.start - r.destination.start for r in by_destination)
+        )
+
+    def destination_of(self, sid: int) -> int:
+        i = bisect_right(self.source_starts, sid) - 1
+        if i >= 0 and sid - self.source_starts[i] < self.source_lengths[i]:
+            return sid + self.source_offsets[i]
+        return sid
+
+    def source_of(self, did: int) -> int:
+        i = bisect_right(self.destination_starts, did) - 1
+        if i >= 0 and did - self.destination_starts[i] < self.destination_lengths[i]:
+            return did + self.destination_offsets[i]
+        return did
+
+    def source_span(self, did: int) -> tuple[int, int | float]:
+        """
+        The source of did, and how many ids from did up share its offset
+        """
+        i = bisect_right(self.destination_starts, did) - 1
+        if i >= 0 and did - self.destination_starts[i] < self.destination_lengths[i]:
+            stop = self.destination_starts[i] + self.destination_lengths[i]
+            return did + self.destination_offsets[i], stop - did
+
+        # Unmapped ids map to themselves up to the next destination range
+        if i + 1 < len(self.destination_starts):
+            return did, self.destination_starts[i + 1] - did
+        return did, inf
+
+
 def chunks(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i : i + n]
@@ -28,24 +93,19 @@ def chunks(lst, n):
 class Maps(object):
     def __init__(self, filepath):
         self.seeds = []
-        self.seed_to_soil = []
-        self.soil_to_fertilizer = []
-        self.fertilizer_to_water = []
-        self.water_to_light = []
-        self.light_to_temperature = []
-        self.temperature_to_humidity = []
-        self.humidity_to_location = []
-
-        self.seed_mem = {}
+        self.stages: list[Stage] = []
 
+        stages: dict[str, Stage] = {}
         current_map = None
-        with input_file.open() as f:
-            for line in map(str.strip, f.readlines()):
+        with filepath.open() as f:
+            for line in map(str.strip, f):
                 if not line:
                     current_map = None
+                    continue
 
                 if current_map is not None:
-                    current_map.append(RangeMap(*list(map(int, line.split(" ")))))
+                    current_map.append(RangeMap(*map(int, line.split())))
+                    continue
 
                 if line.startswith("seeds: "):
                     for source, count in chunks(
@@ -54,70 +114,80 @@ class Maps(object):
                         self.seeds.append(range(source, source + count))
                     continue
 
-                if line.startswith("seed-to-soil map"):
-                    current_map = self.seed_to_soil
-                    continue
+                if match := MAP_HEADER.match(line):
+                    current_map = stages[match["source"]] = Stage(*match.groups())
+
+        # Chain the stages by name, from seeds to wherever the last one leads
+        category = "seed"
+        while category in stages:
+            self.stages.append(stages.pop(category))
+            category = self.stages[-1].destination_category
+
+        if stages:
+            raise ValueError(f"Maps not reachable from seed: {', '.join(stages)}")
+
+        for stage in self.stages:
+            stage.build()
+
+    def _walk_back(self, location: int) -> tuple[list[int], int | float]:
+        """
+        Every id from location back to its seed, and how many locations from this
+        one up go back through the same piece of every stage
+        """
+        ids = [location]
+        span: int | float = inf
+        for stage in reversed(self.stages):
+            sid, stage_span = stage.source_span(ids[-1])
+            ids.append(sid)
+            span = min(span, stage_span)
+        return ids, span
 
-                if line.startswith("soil-to-fertilizer map"):
-                    current_map = self.soil_to_fertilizer
-                    continue
+    def find_lowest_location(self) -> int:
+        # Work backwards from location 0 and go up, a segment at a time. Inside a
+        # segment every stage shifts by a constant, so its seeds are one contiguous
+        # run and the first valid one is wherever that run meets a seed range
+        location = 0
+        while True:
+            ids, span = self._walk_back(location)
+            offset = ids[-1] - location
+            low, high = location + offset, location + span + offset
 
-                if line.startswith("fertilizer-to-water map"):
-                    current_map = self.fertilizer_to_water
-                    continue
+            seeds = [
+                max(low, r.start)
+                for r in self.seeds
+                if max(low, r.start) < min(high, r.stop)
+            ]
+            if seeds:
+                seed = min(seeds)
+                ids, _ = self._walk_back(seed - offset)
+                print(" -> ".join(map(str, reversed(ids))))
+                return seed - offset
 
-                if line.startswith("water-to-light map"):
-                    current_map = self.water_to_light
-                    continue
+            if not isinstance(span, int):
+                # Every stage's last piece runs on forever, there's nothing left
+                return -1
+            location += span
 
-                if line.startswith("light-to-temperature map"):
-                    current_map = self.light_to_temperature
-                    continue
 
-                if line.startswith("temperature-to-humidity map"):
-                    current_map = self.temperature_to_humidity
-                    continue
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
 
-                if line.startswith("humidity-to-location map"):
-                    current_map = self.humidity_to_location
-                    continue
+    maps = Maps(pargs.input_path)
+    lowest = maps.find_lowest_location()
 
-    def _get_source(self, did: int, mapping: list):
-        for r in mapping:
-            if did in r.destination:
-                return r.source[r.destination.index(did)]
-        return did
+    print(lowest)
+    return lowest
 
-    def find_lowest_location(self) -> int:
-        # Find highest location value
-        max_location = max(
-            self.humidity_to_location, key=lambda x: x.destination.stop
-        ).destination.stop
-
-        # Work backwards from location 0 and go up
-        for location in range(0, max_location + 1):
-            seed = soil = fertilizer = water = light = temperature = humidity = -1
-
-            humidity = self._get_source(location, self.humidity_to_location)
-            temperature = self._get_source(humidity, self.temperature_to_humidity)
-            light = self._get_source(temperature, self.light_to_temperature)
-            water = self._get_source(light, self.water_to_light)
-            fertilizer = self._get_source(water, self.fertilizer_to_water)
-            soil = self._get_source(fertilizer, self.soil_to_fertilizer)
-            seed = self._get_source(soil, self.seed_to_soil)
-
-            for seed_range in self.seeds:
-                if seed in seed_range:
-                    print(
-                        f"{seed} -> {soil} -> {fertilizer} -> {water} -> {light} -> "
-                        f"{temperature} -> {humidity} -> {location}"
-                    )
-                    return seed
-
-        return -1
-
-
-maps = Maps(input_file)
-lowest = maps.find_lowest_location()
-
-# print(lowest)
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("input_path", type=lambda p: Path(p).absolute())
+
+    add_common_args(parser)
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    run(main)
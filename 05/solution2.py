@@ -1,7 +1,24 @@
+import argparse
+import multiprocessing as mp
+import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import inf
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
 
+from aoc.cli import add_common_args, run
+from aoc.memo import MISSING, POLICIES, Cache, make_cache
+from aoc.trace import ic
 
-input_file = Path("input")
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+MAP_HEADER = re.compile(r"(?P<source>\w+)-to-(?P<destination>\w+) map:")
 
 
 class RangeMap(object):
@@ -20,6 +37,106 @@ class RangeMap(object):
         return str(self)
 
 
+class PiecewiseMap(object):
+    """
+    An id -> id mapping over every id from 0 up, stored as sorted breakpoints. Ids from
+    starts[i] up to starts[i + 1] all move by offsets[i].
+    """
+
+    def __init__(self, pieces: list[tuple[int, int]]):
+        self.starts: list[int] = []
+        self.offsets: list[int] = []
+        for start, offset in pieces:
+            # Neighbouring pieces that move by the same amount are really one piece
+            if self.offsets and self.offsets[-1] == offset:
+                continue
+            self.starts.append(start)
+            self.offsets.append(offset)
+
+    @classmethod
+    def from_range_maps(cls, mapping: list[RangeMap]) -> "PiecewiseMap":
+        pieces: list[tuple[int, int]] = []
+        current = 0
+        for r in sorted(mapping, key=lambda r: r.source.start):
+            if r.source.start > current:
+                # Nothing covers the gap, so those ids map to themselves
+                pieces.append((current, 0))
+            pieces.append((r.source.start, r.destination.start - r.source.start))
+            current = r.source.stop
+        pieces.append((current, 0))
+        return cls(pieces)
+
+    def stop(self, i: int) -> int | float:
+        return self.starts[i + 1] if i + 1 < len(self.starts) else inf
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """
+        Compose with the next stage, ie: other(self(sid)) as a single map
+        """
+        pieces: list[tuple[int, int]] = []
+        for i, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            # Split this piece's image wherever the next stage has a breakpoint
+            low, high = start + offset, self.stop(i) + offset
+            j = bisect_right(other.starts, low) - 1
+            while low < high:
+                pieces.append((low - offset, offset + other.offsets[j]))
+                if j + 1 == len(other.starts):
+                    # The next stage's last piece runs on forever
+                    break
+                j += 1
+                low = other.starts[j]
+        return PiecewiseMap(pieces)
+
+    def __call__(self, sid: int) -> int:
+        return sid + self.offsets[bisect_right(self.starts, sid) - 1]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class Stage(list):
+    """
+    The RangeMaps for one stage, plus sorted parallel arrays of them by source and by
+    destination so an id can be looked up either way with a bisect.
+    """
+
+    def __init__(self, source_category: str = "", destination_category: str = ""):
+        super().__init__()
+        self.source_category = source_category
+        self.destination_category = destination_category
+
+    def build(self) -> None:
+        by_source = sorted(self, key=lambda r: r.source.start)
+        self.source_starts = array("q", (r.source.start for r in by_source))
+        self.source_lengths = array("q", (len(r.source) for r in by_source))
+        self.source_offsets = array(
+            "q", (r.destination.start - r.source.start for r in by_source)
+        )
+
+        by_destination = sorted(self, key=lambda r: r.destination.start)
+        self.destination_starts = array(
+            "q", (r.destination.start for r in by_destination)
+        )
+        self.destination_lengths = array(
+            "q", (len(r.destination) for r in by_destination)
+        )
+        self.destination_offsets = array(
+            "q", (r.source.start - r.destination.start for r in by_destination)
+        )
+
+    def destination_of(self, sid: int) -> int:
+        i = bisect_right(self.source_starts, sid) - 1
+        if i >= 0 and sid - self.source_starts[i] < self.source_lengths[i]:
+            return sid + self.source_offsets[i]
+        return sid
+
+    def source_of(self, did: int) -> int:
+        i = bisect_right(self.destination_starts, did) - 1
+        if i >= 0 and did - self.destination_starts[i] < self.destination_lengths[i]:
+            return did + self.destination_offsets[i]
+        return did
+
+
 def chunks(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i : i + n]
@@ -28,24 +145,19 @@ def chunks(lst, n):
 class Maps(object):
     def __init__(self, filepath):
         self.seeds = []
-        self.seed_to_soil = []
-        self.soil_to_fertilizer = []
-        self.fertilizer_to_water = []
-        self.water_to_light = []
-        self.light_to_temperature = []
-        self.temperature_to_humidity = []
-        self.humidity_to_location = []
-
-        self.seed_mem = {}
+        self.stages: list[Stage] = []
 
+        stages: dict[str, Stage] = {}
         current_map = None
-        with input_file.open() as f:
-            for line in map(str.strip, f.readlines()):
+        with filepath.open() as f:
+            for line in map(str.strip, f):
                 if not line:
                     current_map = None
+                    continue
 
                 if current_map is not None:
-                    current_map.append(RangeMap(*list(map(int, line.split(" ")))))
+                    current_map.append(RangeMap(*map(int, line.split())))
+                    continue
 
                 if line.startswith("seeds: "):
                     for source, count in chunks(
@@ -54,101 +166,262 @@ class Maps(object):
                         self.seeds.append(range(source, source + count))
                     continue
 
-                if line.startswith("seed-to-soil map"):
-                    current_map = self.seed_to_soil
-                    continue
-
-                if line.startswith("soil-to-fertilizer map"):
-                    current_map = self.soil_to_fertilizer
-                    continue
-
-                if line.startswith("fertilizer-to-water map"):
-                    current_map = self.fertilizer_to_water
-                    continue
-
-                if line.startswith("water-to-light map"):
-                    current_map = self.water_to_light
-                    continue
-
-                if line.startswith("light-to-temperature map"):
-                    current_map = self.light_to_temperature
-                    continue
-
-                if line.startswith("temperature-to-humidity map"):
-                    current_map = self.temperature_to_humidity
-                    continue
-
-                if line.startswith("humidity-to-location map"):
-                    current_map = self.humidity_to_location
+                if match := MAP_HEADER.match(line):
+                    current_map = stages[match["source"]] = Stage(*match.groups())
+
+        # Chain the stages by name, from seeds to wherever the last one leads
+        category = "seed"
+        while category in stages:
+            self.stages.append(stages.pop(category))
+            category = self.stages[-1].destination_category
+
+        if stages:
+            raise ValueError(f"Maps not reachable from seed: {', '.join(stages)}")
+
+        for stage in self.stages:
+            stage.build()
+
+        # Fold every stage into one seed -> location map so a lookup is one bisect
+        self.seed_to_location = PiecewiseMap([(0, 0)])
+        for mapping in self.stages:
+            self.seed_to_location = self.seed_to_location.then(
+                PiecewiseMap.from_range_maps(mapping)
+            )
+
+    def location(self, seed: int) -> int:
+        return self.seed_to_location(seed)
+
+    def locations(self, seeds: "np.ndarray") -> tuple["np.ndarray", int]:
+        """
+        Map a whole array of seeds through every stage at once, returning their
+        locations and the lowest of them. Needs numpy.
+        """
+        import numpy as np
+
+        ids = np.asarray(seeds, dtype=np.int64)
+        for stage in self.stages:
+            if not stage:
+                continue
+
+            # Stage arrays are typecode "q", so numpy can view them without copying
+            starts = np.frombuffer(stage.source_starts, dtype=np.int64)
+            lengths = np.frombuffer(stage.source_lengths, dtype=np.int64)
+            offsets = np.frombuffer(stage.source_offsets, dtype=np.int64)
+
+            i = np.searchsorted(starts, ids, side="right") - 1
+            found = np.maximum(i, 0)
+            inside = (i >= 0) & (ids - starts[found] < lengths[found])
+            ids = ids + np.where(inside, offsets[found], 0)
+
+        return ids, int(ids.min()) if ids.size else -1
+
+    def sample_seeds(self, count: int, seed: int = 0) -> "np.ndarray":
+        """
+        Pick `count` seeds uniformly from all of the seed ranges. Needs numpy.
+        """
+        import numpy as np
+
+        starts = np.array([r.start for r in self.seeds], dtype=np.int64)
+        sizes = np.array([len(r) for r in self.seeds], dtype=np.int64)
+        ends = np.cumsum(sizes)
+
+        # Pick a position along all the ranges laid end to end, then map it back
+        positions = np.random.default_rng(seed).integers(0, ends[-1], count)
+        which = np.searchsorted(ends, positions, side="right")
+        return starts[which] + positions - (ends[which] - sizes[which])
+
+    def _map_ranges(self, ranges: list[range], mapping: list[RangeMap]) -> list[range]:
+        mapped: list[range] = []
+        for r in mapping:
+            unmapped: list[range] = []
+            for id_range in ranges:
+                # Split the range into the part this RangeMap covers, which moves, and
+                # whatever is left either side of it, which the next RangeMap may cover
+                start = max(id_range.start, r.source.start)
+                stop = min(id_range.stop, r.source.stop)
+                if start >= stop:
+                    unmapped.append(id_range)
                     continue
 
-    def _get_mapping(self, sid: int, mapping: list, memory: dict) -> int:
-        if sid in memory:
-            return memory[sid]
+                offset = r.destination.start - r.source.start
+                mapped.append(range(start + offset, stop + offset))
+                if id_range.start < start:
+                    unmapped.append(range(id_range.start, start))
+                if stop < id_range.stop:
+                    unmapped.append(range(stop, id_range.stop))
+            ranges = unmapped
 
-        for r in mapping:
-            if sid in r.source:
-                val = r.destination[r.source.index(sid)]
-                memory[sid] = val
-                return val
-        memory[sid] = sid
-        return sid
+        # Anything no RangeMap covers maps to itself
+        return mapped + ranges
 
     def find_lowest_location(self) -> int:
-        memory: dict = {x: {} for x in range(0, 7)}
+        # Push whole seed ranges through every stage instead of individual seeds
+        ranges = list(self.seeds)
+        for mapping in self.stages:
+            ranges = self._map_ranges(ranges, mapping)
+            ic(len(ranges))
+
+        return min((r.start for r in ranges if r), default=-1)
+
+    def _get_mapping(self, sid: int, mapping: Stage, memory: Cache) -> int:
+        if (val := memory.get(sid)) is not MISSING:
+            return val
+
+        val = mapping.destination_of(sid)
+        memory.put(sid, val)
+        return val
+
+    def find_lowest_location_brute_force(
+        self,
+        cache_factory: Callable[[], Cache] = make_cache,
+        seeds: Optional[list[range]] = None,
+    ) -> int:
+        # Bounded, so memory stays flat however many seeds the ranges hold
+        self.seed_mem = cache_factory()
+        memory = [cache_factory() for _ in self.stages]
 
         lowest_location = None
-        for seed_range in self.seeds:
+        for seed_range in self.seeds if seeds is None else seeds:
             for seed in seed_range:
-                if seed in self.seed_mem:
-                    location = self.seed_mem[seed]
-                else:
-                    # Find Soil
-                    soil = self._get_mapping(seed, self.seed_to_soil, memory[0])
-                    # print(f"Seed to Soil: {seed} -> {soil}")
-
-                    fertilizer = self._get_mapping(
-                        soil, self.soil_to_fertilizer, memory[1]
-                    )
-                    # print(f"Soil to Fertilizer: {soil} -> {fertilizer}")
-
-                    water = self._get_mapping(
-                        fertilizer, self.fertilizer_to_water, memory[2]
-                    )
-                    # print(f"Fertilizer to Water: {fertilizer} -> {water}")
-
-                    light = self._get_mapping(water, self.water_to_light, memory[3])
-                    # print(f"Water to Light: {water} -> {light}")
-
-                    temperature = self._get_mapping(
-                        light, self.light_to_temperature, memory[4]
-                    )
-                    # print(f"Light to Temperature: {light} -> {temperature}")
-
-                    humidity = self._get_mapping(
-                        temperature, self.temperature_to_humidity, memory[5]
-                    )
-                    # print(f"Temperature to Humidity: {temperature} -> {humidity}")
-
-                    location = self._get_mapping(
-                        humidity, self.humidity_to_location, memory[6]
-                    )
-                    # print(f"Humidity to Location: {humidity} -> {location}")
-
-                    self.seed_mem[seed] = location
-
-                    # print(
-                    #    f"{seed} -> {soil} -> {fertilizer} -> {water} -> {light} -> "
-                    #    f"{temperature} -> {humidity} -> {location}"
-                    # )
-
-                if not lowest_location or location < lowest_location:
-                    lowest_location = location
+                if (location := self.seed_mem.get(seed)) is MISSING:
+                    location = seed
+                    for stage, stage_memory in zip(self.stages, memory):
+                        location = self._get_mapping(location, stage, stage_memory)
+                    self.seed_mem.put(seed, location)
 
-        return lowest_location or -1
-
-
-maps = Maps(input_file)
-lowest = maps.find_lowest_location()
+                if lowest_location is None or location < lowest_location:
+                    lowest_location = location
 
-print(lowest)
+        if ic.enabled:
+            ic(self.seed_mem, memory)
+        return -1 if lowest_location is None else lowest_location
+
+    def find_lowest_location_parallel(
+        self,
+        jobs: int,
+        shard_size: int,
+        cache_factory: Callable[[], Cache] = make_cache,
+    ) -> int:
+        # Cut every seed range into shards and brute force them across a pool
+        shards = [
+            range(start, min(start + shard_size, seed_range.stop))
+            for seed_range in self.seeds
+            for start in range(seed_range.start, seed_range.stop, shard_size)
+        ]
+
+        # Forked workers share these (read only) stage tables instead of each
+        # parsing the input or having them pickled over
+        context = mp.get_context("fork")
+        with ProcessPoolExecutor(
+            jobs,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self, cache_factory),
+        ) as pool:
+            lowest = [x for x in pool.map(_lowest_in_shard, shards) if x >= 0]
+
+        return min(lowest, default=-1)
+
+
+_worker_maps: Optional[Maps] = None
+_worker_cache_factory: Callable[[], Cache] = make_cache
+
+
+def _init_worker(maps: Maps, cache_factory: Callable[[], Cache]) -> None:
+    global _worker_maps, _worker_cache_factory
+    _worker_maps = maps
+    _worker_cache_factory = cache_factory
+
+
+def _lowest_in_shard(shard: range) -> int:
+    assert _worker_maps is not None
+    return _worker_maps.find_lowest_location_brute_force(_worker_cache_factory, [shard])
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
+    input_path = pargs.input_path
+
+    if pargs.quiet:
+        ic.disable()
+
+    maps = Maps(input_path)
+    ic(len(maps.seed_to_location))
+
+    if pargs.locate:
+        for seed in pargs.locate:
+            print(f"{seed} -> {maps.location(seed)}")
+        return 0
+
+    cache_factory = partial(make_cache, pargs.cache, pargs.cache_size)
+    if pargs.sample:
+        # Only an upper bound on the answer, unless we happen to hit the best seed
+        _, lowest = maps.locations(maps.sample_seeds(pargs.sample))
+    elif pargs.parallel:
+        lowest = maps.find_lowest_location_parallel(
+            pargs.jobs, pargs.shard_size, cache_factory
+        )
+    elif pargs.brute_force:
+        lowest = maps.find_lowest_location_brute_force(cache_factory)
+    else:
+        lowest = maps.find_lowest_location()
+
+    print(lowest)
+    return lowest
+
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("input_path", type=lambda p: Path(p).absolute())
+
+    parser.add_argument(
+        "--brute-force", action="store_true", help="Map every single seed (very slow)"
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Brute force seed range shards across --jobs processes",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=2**20,
+        help="Seeds per --parallel shard",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=POLICIES,
+        default="lru",
+        help="Memoisation policy for --brute-force",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=2**16,
+        help="Entries kept per --brute-force cache",
+    )
+    parser.add_argument(
+        "--locate",
+        type=int,
+        nargs="+",
+        metavar="SEED",
+        help="Print the location of each seed instead of solving",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        metavar="N",
+        help="Lowest location of N random seeds, mapped in one go (needs numpy)",
+    )
+
+    add_common_args(parser)
+
+    pargs = parser.parse_args(args)
+    if pargs.cache_size < 1:
+        parser.error("--cache-size must be at least 1, use --cache none for no cache")
+    return pargs
+
+
+if __name__ == "__main__":
+    run(main)
@@ -3,6 +3,8 @@ import re
 from pathlib import Path
 from typing import Optional, Sequence
 
+from aoc.cli import add_common_args, run
+
 
 def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
@@ -53,8 +55,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
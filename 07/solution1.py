@@ -3,7 +3,8 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 CARD_RANK = {
@@ -109,6 +110,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     hands: list[Hand] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
@@ -125,8 +129,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -4,6 +4,8 @@ from math import lcm
 from pathlib import Path
 from typing import Optional, Sequence
 
+from aoc.cli import add_common_args, run
+
 
 class Node:
     def __init__(self, name: str):
@@ -91,8 +93,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -2,13 +2,17 @@ import argparse
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     histories: list[list[int]] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
@@ -39,7 +43,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
         extrapolated_values.append(diff_lists[0][0])
 
-    ic(sum(extrapolated_values))
+    total = sum(extrapolated_values)
+    ic(total)
+    print(total)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -47,8 +53,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
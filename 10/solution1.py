@@ -5,7 +5,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Self, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 # preferredWidth = 20
@@ -161,9 +162,10 @@ class Network:
                 ):
                     continue
 
-                ic(self.location)
-                ic(self.last_location)
-                ic(new_location)
+                if ic.enabled:
+                    ic(self.location)
+                    ic(self.last_location)
+                    ic(new_location)
                 # We can move somewhere, make sure we havent just been there
                 if self.last_location and new_location == self.last_location:
                     continue
@@ -245,6 +247,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     with input_path.open() as f:
         network = Network(f.read())
 
@@ -260,8 +265,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -5,7 +5,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Self, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 # preferredWidth = 20
@@ -278,6 +279,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     with input_path.open() as f:
         network = Network(f.read())
 
@@ -285,6 +289,7 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
     inside = network.find_inside()
     ic(inside)
+    print(inside)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -292,8 +297,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -3,13 +3,17 @@ from itertools import combinations
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     space: list[list[int]] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
@@ -65,6 +69,7 @@ def main(args: Optional[Sequence[str]] = None) -> None:
         # ic(a, b, distance)
         distance_sum += distance
     ic(distance_sum)
+    print(distance_sum)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -72,8 +77,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
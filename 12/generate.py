@@ -0,0 +1,31 @@
+import random
+
+
+ROWS = 1000
+MAX_GROUPS = 6
+MAX_GROUP_SIZE = 5
+UNKNOWN_CHANCE = 0.4
+
+
+def generate(scale: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines: list[str] = []
+    for _ in range(ROWS):
+        # Rows get `scale` times more groups, and so are roughly `scale` times longer
+        groups = [
+            rng.randint(1, MAX_GROUP_SIZE)
+            for _ in range(rng.randint(1, MAX_GROUPS) * scale)
+        ]
+
+        springs = "." * rng.randint(0, 2)
+        for idx, group in enumerate(groups):
+            if idx:
+                springs += "." * rng.randint(1, 3)
+            springs += "#" * group
+        springs += "." * rng.randint(0, 2)
+
+        row = "".join("?" if rng.random() < UNKNOWN_CHANCE else x for x in springs)
+        lines.append(f"{row} {','.join(map(str, groups))}")
+
+    return "\n".join(lines) + "\n"
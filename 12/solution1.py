@@ -3,7 +3,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 class Status(Enum):
@@ -157,6 +158,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     nonograms: list[Nonogram] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
@@ -167,7 +171,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
     all_permutation_counts = [x.find_permutations() for x in nonograms]
     ic(all_permutation_counts)
-    ic(sum(all_permutation_counts))
+    total = sum(all_permutation_counts)
+    ic(total)
+    print(total)
 
     # ic(list(x.find_permutations() for x in nonograms))
     # ic(nonograms[5].find_permutations())
@@ -178,8 +184,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -1,10 +1,16 @@
 import argparse
+import multiprocessing as mp
 import re
-from functools import cache
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cache, lru_cache
+from operator import add
 from pathlib import Path
-from typing import Optional, Pattern, Sequence
+from typing import Iterable, Optional, Pattern, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 # This code is essentially taken from https://github.com/dgDSA/AdventOfCode2023/blob/main/12.py
@@ -12,6 +18,13 @@ from icecream import ic
 
 operational_re = re.compile(r"\.+")
 
+# Up to this many copies, searching the unfolded row directly is quicker than
+# building the automaton
+SEARCH_UNFOLD = 5
+
+# Ways to have finished every group `base + i` times over, or None for no ways
+Window = Optional[tuple[int, list[int]]]
+
 
 class Nonogram:
     def __init__(self, data: str, groups: tuple[int, ...]):
@@ -72,24 +85,268 @@ def find_permutations(data: str, groups: tuple[int, ...]) -> int:
     return successes
 
 
+def count_permutations(data: str, groups: tuple[int, ...]) -> int:
+    """
+    The same search as `find_permutations`, but filled in bottom up from the end
+    of the row, so long rows can't run out of stack.
+    """
+    size = len(data)
+    last_damaged = data.rfind("#")
+
+    # How many operational parts come before each index
+    operational = [0]
+    for item in data:
+        operational.append(operational[-1] + (item == "."))
+
+    # The fewest parts groups[:group_idx] fit in, with an operational part after
+    # each, and the fewest groups[group_idx:] fit in
+    before = [0]
+    for length in groups:
+        before.append(before[-1] + length + 1)
+    after = [before[-1] - 1 - fits for fits in before]
+
+    # ways[idx][group_idx]: arrangements of data[idx:] using groups[group_idx:].
+    # Only the group indices that fit on both sides of idx are filled in, the
+    # rest are never read or have no arrangements anyway
+    ways = [[0] * (len(groups) + 1) for _ in range(size + 1)]
+    ways[size][len(groups)] = 1
+    first = len(groups)
+    for idx in reversed(range(size)):
+        # Just skip the operational parts
+        if data[idx] == ".":
+            ways[idx] = ways[idx + 1]
+            continue
+
+        row = ways[idx]
+        row[len(groups)] = 0 if last_damaged >= idx else 1
+        while first > 0 and after[first - 1] <= size - idx:
+            first -= 1
+        last = min(bisect_right(before, idx), len(groups))
+        for group_idx in range(first, last):
+            length = groups[group_idx]
+            successes = 0
+            if data[idx] == "?":
+                successes += ways[idx + 1][group_idx]
+
+            # Broken parts can run from here if none of them are operational, and
+            # the part after them (if any) can be operational
+            stop = idx + length
+            if (
+                stop <= size
+                and operational[stop] == operational[idx]
+                and (stop == size or data[stop] != "#")
+            ):
+                successes += ways[min(stop + 1, size)][group_idx + 1]
+
+            row[group_idx] = successes
+
+    return ways[0][0]
+
+
+def merge_windows(a: Window, b: Window) -> Window:
+    if a is None:
+        return b
+    if b is None:
+        return a
+
+    a_base, a_ways = a
+    b_base, b_ways = b
+    if a_base == b_base and len(a_ways) == len(b_ways):
+        return a_base, list(map(add, a_ways, b_ways))
+
+    low = min(a_base, b_base)
+    high = max(a_base + len(a_ways), b_base + len(b_ways))
+    ways = [0] * (high - low)
+    ways[a_base - low : a_base - low + len(a_ways)] = a_ways
+    start = b_base - low
+    ways[start : start + len(b_ways)] = map(
+        add, ways[start : start + len(b_ways)], b_ways
+    )
+    return low, ways
+
+
+def most_finished(block: str, groups: tuple[int, ...]) -> int:
+    """
+    The most of the repeating groups reading `block` can finish, starting from any
+    automaton state, or -1 if it can't be read from any state at all.
+    """
+    best = [[0] * (length + 1) for length in groups]
+    for item in block:
+        next_best = [[-1] * (length + 1) for length in groups]
+        for group, length in enumerate(groups):
+            if item != ".":
+                next_best[group][1:] = best[group][:-1]
+            if item != "#":
+                previous = best[group - 1][-1]
+                finished = previous + 1 if previous >= 0 else -1
+                next_best[group][0] = max(best[group][0], finished)
+        best = next_best
+    return max(max(runs) for runs in best)
+
+
+def count_unfolded(data: str, groups: tuple[int, ...], copies: int) -> int:
+    """
+    Count the arrangements of `copies` copies of the row joined by "?", with the
+    groups repeated as often, without ever building the unfolded row.
+
+    The automaton states are (which of the repeating groups we're on, length of the
+    run in progress). Which group we're on is always the groups finished so far
+    modulo len(groups), so each state only needs to track the ways per number of
+    times all the groups have been finished, as a window of counts. A damaged part
+    just moves each window one run length along, and an operational part merges
+    two windows per group.
+    """
+    if copies <= SEARCH_UNFOLD:
+        return count_permutations(
+            "?".join(data for _ in range(copies)), groups * copies
+        )
+
+    # Each copy (and the "?" after it) can't finish more groups than this, so
+    # anything too far behind to finish them all in the copies left is dropped
+    most = most_finished(data + "?", groups)
+    if most < 0:
+        return 0
+
+    def read(windows: list[list[Window]], item: str) -> list[list[Window]]:
+        next_windows: list[list[Window]] = []
+        for group, runs in enumerate(windows):
+            start = None
+            if item != "#":
+                finished = windows[group - 1][-1]
+                if finished is not None and group == 0:
+                    finished = (finished[0] + 1, finished[1])
+                start = merge_windows(runs[0], finished)
+
+            if item != ".":
+                next_windows.append([start, *runs[:-1]])
+            else:
+                next_windows.append([start] + [None] * groups[group])
+        return next_windows
+
+    all_groups = len(groups) * copies
+    windows: list[list[Window]] = [[None] * (length + 1) for length in groups]
+    windows[0][0] = (0, [1])
+    for copy in range(copies):
+        for item in data:
+            windows = read(windows, item)
+        if copy < copies - 1:
+            windows = read(windows, "?")
+
+        lowest = all_groups - (copies - copy - 1) * most - 1
+        for group, runs in enumerate(windows):
+            for run_len, window in enumerate(runs):
+                if window is None:
+                    continue
+                base, ways = window
+                # Finished groups are wraps * len(groups) + group, so keep the
+                # wraps putting them between lowest and all_groups
+                first = max(base, -(-(lowest - group) // len(groups)))
+                last = min(base + len(ways) - 1, (all_groups - group) // len(groups))
+                if first > last:
+                    runs[run_len] = None
+                elif first != base or last != base + len(ways) - 1:
+                    runs[run_len] = (first, ways[first - base : last - base + 1])
+
+    # Either every group has finished, or the last one runs to the end of the row
+    total = 0
+    for window, wraps in ((windows[0][0], copies), (windows[-1][-1], copies - 1)):
+        if window is not None and 0 <= wraps - window[0] < len(window[1]):
+            total += window[1][wraps - window[0]]
+    return total
+
+
+def count_rows(
+    rows: Iterable[tuple[int, Nonogram]], unfold: int, slices: bool = False
+) -> tuple[int, list[tuple[float, int]]]:
+    """
+    Total arrangements for (index, row) pairs, and how long each row took as
+    (seconds, index).
+    """
+    total = 0
+    costs: list[tuple[float, int]] = []
+    for idx, x in rows:
+        start = time.perf_counter()
+        if slices:
+            total += find_permutations(
+                "?".join(x.data for _ in range(unfold)), x.groups * unfold
+            )
+        else:
+            total += count_unfolded(x.data, x.groups, unfold)
+        costs.append((time.perf_counter() - start, idx))
+    return total, costs
+
+
+def _init_worker(cache_size: int) -> None:
+    # Each worker gets its own, bounded, cache instead of the unbounded one it
+    # would otherwise inherit. The recursion looks the name up globally, so it
+    # goes through the new one too
+    global find_permutations
+    find_permutations = lru_cache(maxsize=cache_size)(find_permutations.__wrapped__)
+
+
+def count_rows_parallel(
+    nonograms: list[Nonogram],
+    unfold: int,
+    slices: bool,
+    jobs: int,
+    shard_size: int,
+    cache_size: int,
+) -> tuple[int, list[tuple[float, int]]]:
+    """
+    Like `count_rows` for every row, but rows are sharded across a process pool
+    and partial sums are traced as shards finish.
+    """
+    rows = list(enumerate(nonograms))
+    shards = [rows[i : i + shard_size] for i in range(0, len(rows), shard_size)]
+
+    total = 0
+    costs: list[tuple[float, int]] = []
+    context = mp.get_context("fork")
+    with ProcessPoolExecutor(
+        jobs, mp_context=context, initializer=_init_worker, initargs=(cache_size,)
+    ) as pool:
+        futures = [pool.submit(count_rows, shard, unfold, slices) for shard in shards]
+        for done, future in enumerate(as_completed(futures), 1):
+            partial, shard_costs = future.result()
+            total += partial
+            costs.extend(shard_costs)
+            if ic.enabled:
+                ic(f"{done}/{len(shards)} shards", total)
+
+    return total, costs
+
+
 def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     nonograms: list[Nonogram] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
             data, groups = line.split(" ")
-            nonograms.append(
-                Nonogram(
-                    "?".join(x for x in [data] for _ in range(5)),
-                    tuple(map(int, groups.split(","))) * 5,
-                )
-            )
+            nonograms.append(Nonogram(data, tuple(map(int, groups.split(",")))))
 
     ic(nonograms)
-    all_permutations = [find_permutations(x.data, x.groups) for x in nonograms]
-    ic(sum(all_permutations))
+    if pargs.parallel:
+        total, costs = count_rows_parallel(
+            nonograms,
+            pargs.unfold,
+            pargs.slices,
+            pargs.jobs,
+            pargs.shard_size,
+            pargs.cache_size,
+        )
+    else:
+        total, costs = count_rows(enumerate(nonograms), pargs.unfold, pargs.slices)
+
+    if ic.enabled:
+        for seconds, idx in sorted(costs, reverse=True)[: pargs.slowest]:
+            ic(round(seconds, 4), idx, nonograms[idx])
+    ic(total)
+    print(total)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -97,8 +354,36 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    parser.add_argument(
+        "--unfold", type=int, default=5, help="Copies of each row and its groups"
+    )
+    parser.add_argument(
+        "--slices",
+        action="store_true",
+        help="Recurse on slices of the row with one global cache (the old way)",
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Shard rows across --jobs processes",
+    )
+    parser.add_argument(
+        "--shard-size", type=int, default=100, help="Rows per --parallel shard"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=2**16,
+        help="Entries each --parallel worker caches for --slices",
+    )
+    parser.add_argument(
+        "--slowest", type=int, default=5, help="How many of the slowest rows to trace"
+    )
+
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
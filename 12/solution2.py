@@ -3,7 +3,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 class Status(Enum):
@@ -17,6 +18,10 @@ class Nonogram:
         self.data = self.data_to_status(data)
         self.groups = groups
 
+        # Bit i of each mask is position i of the row
+        self.size = len(self.data)
+        self.damaged, self.operational, self.unknown = self.status_to_masks(self.data)
+
     def permutate(
         self,
         data: list[Status],
@@ -65,37 +70,67 @@ class Nonogram:
         return self.permutate(self.data.copy(), 0, self.groups.copy(), 0)
 
     def iterative_find_permutations(self) -> int:
-        # ic(self.data_to_str(self.data))
-        all_data = [self.data.copy()]
-
-        b = True
-        while b:
-            # ic([self.data_to_str(x) for x in all_data])
-            data = all_data.pop(0)
-            for idx, item in enumerate(data):
-                if item in [Status.OPERATIONAL, Status.DAMAGED]:
-                    continue
-
-                op = data.copy()
-                op[idx] = Status.OPERATIONAL
-                all_data.append(op)
-                dm = data.copy()
-                dm[idx] = Status.DAMAGED
-                all_data.append(dm)
+        # Every subset of the unknowns as a bitmask, counting down from all of them
+        x = 0
+        unknowns = self.unknown
+        while True:
+            x += 1 if self.is_valid_mask(self.damaged | unknowns) else 0
+            if not unknowns:
                 break
-            else:
-                all_data.append(data.copy())
-                b = False
+            unknowns = (unknowns - 1) & self.unknown
 
-        x = 0
-        for data in all_data:
-            valid = self.is_valid_ex(data, self.groups)
-            x += 1 if valid else 0
+        return x
 
-            # if valid:
-            #    ic(self.data_to_str(data))
+    def count_arrangements(self) -> int:
+        """
+        Count valid rows bottom up over (position, group), without ever building a
+        candidate row.
+        """
+        size = self.size
+
+        # ways[i]: how many ways the groups placed so far fit from position i on.
+        # With no groups left, that's only if nothing from i on is damaged
+        ways = [0 if self.damaged >> i else 1 for i in range(size + 2)]
+        for length in reversed(self.groups):
+            group_ways = [0] * (size + 2)
+            for i in reversed(range(size)):
+                # Leave position i operational
+                if not (self.damaged >> i) & 1:
+                    group_ways[i] = group_ways[i + 1]
+
+                # Or start this group's run here, plus the part after it
+                if self.can_place(i, length):
+                    group_ways[i] += ways[i + length + 1]
+            ways = group_ways
+
+        return ways[0]
+
+    def can_place(self, start: int, length: int) -> bool:
+        """
+        Whether a run of `length` damaged parts can start at `start`, ie: none of
+        them are operational and the part after it isn't damaged.
+        """
+        if start + length > self.size:
+            return False
+
+        run_mask = ((1 << length) - 1) << start
+        if self.operational & run_mask:
+            return False
+
+        return not (self.damaged >> (start + length)) & 1
+
+    def is_valid_mask(self, damaged: int) -> bool:
+        # Peel off each run of damaged bits from the bottom and compare with groups
+        idx = 0
+        while damaged:
+            damaged >>= (damaged & -damaged).bit_length() - 1
+            count = (damaged ^ (damaged + 1)).bit_length() - 1
+            if idx == len(self.groups) or count != self.groups[idx]:
+                return False
+            damaged >>= count
+            idx += 1
 
-        return x
+        return idx == len(self.groups)
 
     def is_valid_ex(self, data: list[Status], groups: list[int]):
         idx = 0
@@ -179,6 +214,13 @@ class Nonogram:
 
         return result
 
+    def status_to_masks(self, data: list[Status]) -> tuple[int, int, int]:
+        masks = {status: 0 for status in Status}
+        for idx, item in enumerate(data):
+            masks[item] |= 1 << idx
+
+        return masks[Status.DAMAGED], masks[Status.OPERATIONAL], masks[Status.UNKNOWN]
+
     def data_to_str(self, data: list[Status]) -> str:
         result: list[str] = []
 
@@ -204,6 +246,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     nonograms: list[Nonogram] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
@@ -219,8 +264,12 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
     ic(nonograms)
 
-    result = sum(x.iterative_find_permutations() for x in nonograms)
+    if pargs.brute_force:
+        result = sum(x.iterative_find_permutations() for x in nonograms)
+    else:
+        result = sum(x.count_arrangements() for x in nonograms)
     ic(result)
+    print(result)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -228,8 +277,16 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    parser.add_argument(
+        "--brute-force",
+        action="store_true",
+        help="Check every assignment of the unknowns (very slow)",
+    )
+
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
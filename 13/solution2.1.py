@@ -2,7 +2,8 @@ import argparse
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 def single_diff(a: str, b: str) -> bool:
@@ -68,6 +69,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     # Parse All Areas
     areas: list[list[str]] = []
     with input_path.open() as f:
@@ -89,21 +93,27 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     result = 0
     for idx in range(len(areas)):
         ic(areas[idx])
-        print("Rows")
+        if ic.enabled:
+            print("Rows")
         row_max = check_mirror(areas[idx])
-        print("Cols")
+        if ic.enabled:
+            print("Cols")
         col_max = check_mirror(t_areas[idx])
-        print()
+        if ic.enabled:
+            print()
 
         if col_max > row_max:
             result += col_max
         else:
             result += row_max * 100
 
-        print("Results")
+        if ic.enabled:
+            print("Results")
         ic(idx, row_max, col_max)
-        print()
+        if ic.enabled:
+            print()
     ic(result)
+    print(result)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -111,8 +121,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
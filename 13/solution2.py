@@ -3,7 +3,8 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 def check_mirror(area: list[str]) -> int:
@@ -91,6 +92,9 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     # Parse All Areas
     areas: list[list[str]] = []
     with input_path.open() as f:
@@ -133,7 +137,8 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     result = 0
     for idx in range(len(areas)):
         ic(areas[idx])
-        print("Rows")
+        if ic.enabled:
+            print("Rows")
         # row_max = check_mirror(areas[idx])
         row_max = 0
 
@@ -147,10 +152,12 @@ def main(args: Optional[Sequence[str]] = None) -> None:
         rm = [x for x in fixed_areas_max if x]
         row_max = rm[0] if rm else 0
 
-        print("Cols")
+        if ic.enabled:
+            print("Cols")
         # col_max = check_mirror(t_areas[idx])
         col_max = 0
-        print()
+        if ic.enabled:
+            print()
 
         if row_max == 0:
             # Check all smudge fixed cols
@@ -168,10 +175,13 @@ def main(args: Optional[Sequence[str]] = None) -> None:
         else:
             result += row_max * 100
 
-        print("Results")
+        if ic.enabled:
+            print("Results")
         ic(idx, row_max, col_max)
-        print()
+        if ic.enabled:
+            print()
     ic(result)
+    print(result)
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -179,8 +189,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
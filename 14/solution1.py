@@ -2,7 +2,8 @@ import argparse
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 ROCK = 0
@@ -52,25 +53,32 @@ def print_platform(platform: list[list[int]]) -> str:
     return output[:-1]
 
 
-def main(args: Optional[Sequence[str]] = None) -> None:
+def main(args: Optional[Sequence[str]] = None) -> int:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     platform: list[list[int]] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
             line = line.replace("O", "0").replace("#", "1").replace(".", "7")
             platform.append(list(map(int, line)))
 
-    print(print_platform(platform))
+    if ic.enabled:
+        print(print_platform(platform))
 
     tilt_platform_north(platform)
 
-    print("\n\n")
-    print(print_platform(platform))
+    if ic.enabled:
+        print("\n\n")
+        print(print_platform(platform))
 
     load = get_platform_load(platform)
     ic(load)
+    print(load)
+    return load
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -78,8 +86,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -3,7 +3,8 @@ from functools import cache
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 ROCK = 0
@@ -87,10 +88,13 @@ def cycle_platform(
     return platform
 
 
-def main(args: Optional[Sequence[str]] = None) -> None:
+def main(args: Optional[Sequence[str]] = None) -> int:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
+    if pargs.quiet:
+        ic.disable()
+
     platform_tmp: list[list[int]] = []
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
@@ -99,16 +103,20 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
     platform = tuple(tuple(x) for x in platform_tmp)
 
-    print(print_platform(platform))
+    if ic.enabled:
+        print(print_platform(platform))
 
     # It was determined that cycle 1_000_000_000 would be the same result as cycle 136
     platform = cycle_platform(platform, 136, detect=False)
 
-    print("\n\n")
-    print(print_platform(platform))
+    if ic.enabled:
+        print("\n\n")
+        print(print_platform(platform))
 
     load = get_platform_load(platform)
     ic(load)
+    print(load)
+    return load
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -116,8 +124,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
+    add_common_args(parser)
+
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -2,7 +2,8 @@ import argparse
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 def hash_algo(instruction: str) -> int:
@@ -31,7 +32,8 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     hashes: list[int] = []
     for instruction in seq:
         res = hash_algo(instruction)
-        ic(instruction, res)
+        if ic.enabled:
+            ic(instruction, res)
         hashes.append(res)
 
     _sum = sum(hashes)
@@ -44,10 +46,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
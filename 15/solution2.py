@@ -4,7 +4,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 SPLIT_RE = re.compile(r"(?P<inst>[A-Za-z]+)(?:=|-)(?P<focal>\d+)?")
@@ -68,7 +69,8 @@ class HashMap:
                 power = (1 + key) * (idx + 1) * item.focal_length
                 _sum += power
 
-                ic(key, idx, item.focal_length, power)
+                if ic.enabled:
+                    ic(key, idx, item.focal_length, power)
 
         return _sum
 
@@ -146,10 +148,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -0,0 +1,21 @@
+import math
+import random
+
+
+SIDE = 110
+MIRROR_CHANCE = 0.1
+
+
+def generate(scale: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    # `scale` times the number of cells of the real 110x110 input
+    side = round(SIDE * math.sqrt(scale))
+    rows = (
+        "".join(
+            rng.choice("|-/\\") if rng.random() < MIRROR_CHANCE else "."
+            for _ in range(side)
+        )
+        for _ in range(side)
+    )
+    return "\n".join(rows) + "\n"
@@ -1,12 +1,13 @@
 import argparse
-import sys
 from abc import ABC, abstractmethod
+from collections import deque
 from copy import deepcopy
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 class Dir(Enum):
@@ -14,7 +15,13 @@ class Dir(Enum):
     E = 1
     S = 2
     W = 3
-    MT = 4
+
+
+HEADINGS = (Dir.N, Dir.E, Dir.S, Dir.W)
+
+# How far a step in each direction moves, indexed by Dir value
+ROW_STEP = (-1, 0, 1, 0)
+COL_STEP = (0, 1, 0, -1)
 
 
 class Mirror(ABC):
@@ -154,41 +161,6 @@ class Instruction:
         self.col = col
         self.direction = direction
 
-    def apply(self, grid: "Grid") -> "list[Instruction] | None":
-        # The instruction is off the grid
-        if self.row < 0 or self.row >= len(grid.data):
-            return None
-
-        if self.col < 0 or self.col >= len(grid.data[0]):
-            return None
-
-        # If we have visited this mirror before going the same direction, stop
-        if self.direction in grid.energized[self.row][self.col]:
-            return None
-
-        # Set the current direction on the mirror
-        grid.energized[self.row][self.col].append(self.direction)
-        if Dir.MT in grid.energized[self.row][self.col]:
-            grid.ener_count += 1
-            del grid.energized[self.row][self.col][0]
-
-        # Grab the mirror
-        directions = grid.data[self.row][self.col].enter(self.direction)
-
-        output: list[Instruction] = []
-        for direction in directions:
-            match direction:
-                case Dir.N:
-                    instruction = Instruction(self.row - 1, self.col, Dir.N)
-                case Dir.E:
-                    instruction = Instruction(self.row, self.col + 1, Dir.E)
-                case Dir.S:
-                    instruction = Instruction(self.row + 1, self.col, Dir.S)
-                case Dir.W:
-                    instruction = Instruction(self.row, self.col - 1, Dir.W)
-            output.append(instruction)
-        return output
-
     def __str__(self) -> str:
         return f"<{self.row}, {self.col}, {self.direction.name}>"
 
@@ -199,24 +171,64 @@ class Instruction:
 class Grid:
     def __init__(self, data: list[list[Mirror]]):
         self.data = data
-        self.energized: list[list[list[Dir]]] = [
-            [[Dir.MT] for _ in row] for row in self.data
-        ]
+        self.rows = len(data)
+        self.cols = len(data[0])
+        self.exits = self.build_exits()
+        # One bit per heading for every cell, row by row
+        self.energized = bytearray(self.rows * self.cols)
         self.ener_count = 0
 
     def energize(self, inst: Instruction) -> None:
-        instructions = inst.apply(self)
+        """
+        Follow the beam from inst, and every beam it splits into, with a work list of
+        packed (cell << 2 | heading) states instead of recursing. Each cell of
+        `energized` is a mask of the headings beams have crossed it in.
+        """
+        rows, cols, exits = self.rows, self.cols, self.exits
+        energized = self.energized
+        count = 0
+
+        queue = deque([((inst.row * cols + inst.col) << 2) | inst.direction.value])
+        while queue:
+            state = queue.pop()
+            cell = state >> 2
+            heading = 1 << (state & 3)
 
-        if not instructions:
-            return
+            # If we have visited this mirror before going the same direction, stop
+            seen = energized[cell]
+            if seen & heading:
+                continue
 
-        # print(inst)
-        # print(self.location(inst))
-        # print(self.ener_str())
-        # print()
+            # Set the current direction on the mirror
+            if not seen:
+                count += 1
+            energized[cell] = seen | heading
 
-        for instruction in instructions:
-            self.energize(instruction)
+            row, col = divmod(cell, cols)
+
+            for direction in exits[state]:
+                next_row = row + ROW_STEP[direction]
+                next_col = col + COL_STEP[direction]
+
+                # Beams going off the grid just stop
+                if 0 <= next_row < rows and 0 <= next_col < cols:
+                    queue.append(((next_row * cols + next_col) << 2) | direction)
+
+        self.ener_count += count
+
+    def build_exits(self) -> list[tuple[int, ...]]:
+        """
+        Which directions a beam leaves in, for every packed (cell, heading) state
+        """
+        leaving: dict[tuple[type, Dir], tuple[int, ...]] = {}
+        exits: list[tuple[int, ...]] = []
+        for row in self.data:
+            for mirror in row:
+                for heading in HEADINGS:
+                    if (key := (type(mirror), heading)) not in leaving:
+                        leaving[key] = tuple(d.value for d in mirror.enter(heading))
+                    exits.append(leaving[key])
+        return exits
 
     def energized_count(self) -> int:
         return self.ener_count
@@ -247,25 +259,14 @@ class Grid:
 
     def ener_str(self) -> str:
         output = ""
-        for row in self.energized:
-            r_str = ""
-            for col in row:
-                if Dir.MT in col:
-                    del col[0]
-                r_str += f"{len(col)}"
-            output += f"{r_str}\n"
-
-        # output = ""
-        # for row in self.energized:
-        #    r_str = ""
-        #    for col in row:
-        #        r_str += f"[{','.join(x.name for x in col)}]"
-        #    output += f"{r_str}\n"
+        for row in range(self.rows):
+            cells = self.energized[row * self.cols : (row + 1) * self.cols]
+            output += "".join(str(mask.bit_count()) for mask in cells) + "\n"
 
         return output
 
 
-def main(args: Optional[Sequence[str]] = None) -> None:
+def main(args: Optional[Sequence[str]] = None) -> int:
     pargs = parse_args(args)
     input_path = pargs.input_path
 
@@ -284,10 +285,14 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     # print(grid.ener_str())
 
     # Start at row 0, column 0, going East
-    sys.setrecursionlimit(100000)
     grid.energize(Instruction(0, 0, Dir.E))
-    print(grid.ener_str())
-    ic(grid.energized_count())
+    if ic.enabled:
+        print(grid.ener_str())
+
+    energized = grid.energized_count()
+    ic(energized)
+    print(energized)
+    return energized
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -295,10 +300,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
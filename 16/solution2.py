@@ -1,12 +1,15 @@
 import argparse
-import sys
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
 from copy import deepcopy
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.parse_cache import Arrays, load, parse_grid
+from aoc.trace import ic
 
 
 class Dir(Enum):
@@ -14,7 +17,19 @@ class Dir(Enum):
     E = 1
     S = 2
     W = 3
-    MT = 4
+
+
+HEADINGS = (Dir.N, Dir.E, Dir.S, Dir.W)
+
+# How far a step in each direction moves, indexed by Dir value
+ROW_STEP = (-1, 0, 1, 0)
+COL_STEP = (0, 1, 0, -1)
+
+# The Dir values set in each exit mask
+MASK_HEADINGS = tuple(
+    tuple(d for d in range(len(HEADINGS)) if mask >> d & 1)
+    for mask in range(1 << len(HEADINGS))
+)
 
 
 class Mirror(ABC):
@@ -154,38 +169,6 @@ class Instruction:
         self.col = col
         self.direction = direction
 
-    def apply(self, grid: "Grid") -> "list[Instruction] | None":
-        # The instruction is off the grid
-        if self.row < 0 or self.row >= len(grid.data):
-            return None
-
-        if self.col < 0 or self.col >= len(grid.data[0]):
-            return None
-
-        # If we have visited this mirror before going the same direction, stop
-        if self.direction in grid.energized[self.row][self.col]:
-            return None
-
-        # Set the current direction on the mirror
-        grid.energize_spot(self)
-
-        # Grab the mirror
-        directions = grid.data[self.row][self.col].enter(self.direction)
-
-        output: list[Instruction] = []
-        for direction in directions:
-            match direction:
-                case Dir.N:
-                    instruction = Instruction(self.row - 1, self.col, Dir.N)
-                case Dir.E:
-                    instruction = Instruction(self.row, self.col + 1, Dir.E)
-                case Dir.S:
-                    instruction = Instruction(self.row + 1, self.col, Dir.S)
-                case Dir.W:
-                    instruction = Instruction(self.row, self.col - 1, Dir.W)
-            output.append(instruction)
-        return output
-
     def __str__(self) -> str:
         return f"<{self.row}, {self.col}, {self.direction.name}>"
 
@@ -194,37 +177,67 @@ class Instruction:
 
 
 class Grid:
-    def __init__(self, data: list[list[Mirror]]):
-        self.data = data
-        self.energized: list[list[list[Dir]]]
-        self.ener_count: int
-
-        self.reset()
+    def __init__(
+        self, cells: Sequence[int], exits: Sequence[int], rows: int, cols: int
+    ):
+        self.cells = cells
+        self.exits = exits
+        self.rows = rows
+        self.cols = cols
+        # One bit per heading for every cell, row by row
+        self.energized = bytearray(self.rows * self.cols)
+        self.ener_count = 0
+        self.blank = bytes(len(self.energized))
 
     def reset(self) -> None:
-        self.energized = [[[Dir.MT] for _ in row] for row in self.data]
+        self.energized[:] = self.blank
         self.ener_count = 0
 
-    def energize_spot(self, inst: Instruction) -> None:
-        # Set the current direction on the mirror
-        self.energized[inst.row][inst.col].append(inst.direction)
-        if Dir.MT in self.energized[inst.row][inst.col]:
-            self.ener_count += 1
-            del self.energized[inst.row][inst.col][0]
-
     def energize(self, inst: Instruction) -> None:
-        instructions = inst.apply(self)
-
-        if not instructions:
-            return
-
-        # print(inst)
-        # print(self.location(inst))
-        # print(self.ener_str())
-        # print()
-
-        for instruction in instructions:
-            self.energize(instruction)
+        """
+        Follow the beam from inst, and every beam it splits into, with a work list of
+        packed (cell << 2 | heading) states instead of recursing. Each cell of
+        `energized` is a mask of the headings beams have crossed it in.
+        """
+        rows, cols, exits = self.rows, self.cols, self.exits
+        energized = self.energized
+        count = 0
+
+        queue = deque([((inst.row * cols + inst.col) << 2) | inst.direction.value])
+        while queue:
+            state = queue.pop()
+            cell = state >> 2
+            heading = 1 << (state & 3)
+
+            # If we have visited this mirror before going the same direction, stop
+            seen = energized[cell]
+            if seen & heading:
+                continue
+
+            # Set the current direction on the mirror
+            if not seen:
+                count += 1
+            energized[cell] = seen | heading
+
+            row, col = divmod(cell, cols)
+
+            for direction in MASK_HEADINGS[exits[state]]:
+                next_row = row + ROW_STEP[direction]
+                next_col = col + COL_STEP[direction]
+
+                # Beams going off the grid just stop
+                if 0 <= next_row < rows and 0 <= next_col < cols:
+                    queue.append(((next_row * cols + next_col) << 2) | direction)
+
+        self.ener_count += count
+
+    @property
+    def data(self) -> list[list[Mirror]]:
+        # Only the debug output needs the mirrors themselves
+        return [
+            [Mirror.create(chr(symbol)) for symbol in self.cells[row : row + self.cols]]
+            for row in range(0, self.rows * self.cols, self.cols)
+        ]
 
     def energized_count(self) -> int:
         return self.ener_count
@@ -255,24 +268,33 @@ class Grid:
 
     def ener_str(self) -> str:
         output = ""
-        for row in self.energized:
-            r_str = ""
-            for col in row:
-                if Dir.MT in col:
-                    del col[0]
-                r_str += f"{len(col)}"
-            output += f"{r_str}\n"
-
-        # output = ""
-        # for row in self.energized:
-        #    r_str = ""
-        #    for col in row:
-        #        r_str += f"[{','.join(x.name for x in col)}]"
-        #    output += f"{r_str}\n"
+        for row in range(self.rows):
+            cells = self.energized[row * self.cols : (row + 1) * self.cols]
+            output += "".join(str(mask.bit_count()) for mask in cells) + "\n"
 
         return output
 
 
+def parse_beams(input_path: Path) -> Arrays:
+    """
+    The grid, plus a mask of the directions a beam leaves in for every packed
+    (cell << 2 | heading) state, so the cache holds Grid's exit table too.
+    """
+    grid = parse_grid(input_path)
+
+    leaving: dict[int, tuple[int, ...]] = {}
+    exits = array("B")
+    for symbol in grid["cells"]:
+        if symbol not in leaving:
+            mirror = Mirror.create(chr(symbol))
+            leaving[symbol] = tuple(
+                sum(1 << d.value for d in mirror.enter(heading)) for heading in HEADINGS
+            )
+        exits.extend(leaving[symbol])
+
+    return {"cells": grid["cells"], "exits": exits, "shape": grid["shape"]}
+
+
 def main(args: Optional[Sequence[str]] = None) -> None:
     pargs = parse_args(args)
     input_path = pargs.input_path
@@ -280,32 +302,25 @@ def main(args: Optional[Sequence[str]] = None) -> None:
     if pargs.quiet:
         ic.disable()
 
-    data: list[list[Mirror]] = []
-    with input_path.open() as f:
-        for line in map(str.strip, f.readlines()):
-            m_row: list[Mirror] = []
-            for symbol in list(line):
-                m_row.append(Mirror.create(symbol))
-            data.append(m_row)
+    views = load(input_path, "beams", parse_beams)
+    rows, cols = views["shape"]
 
-    grid = Grid(data)
+    grid = Grid(views["cells"], views["exits"], rows, cols)
     # print(grid.ener_str())
 
-    sys.setrecursionlimit(100000)
-
     # We want to try for every single edge to find the best solution
     # First let's generate all the instructions we need
     instructions: list[Instruction] = []
-    for row, values in enumerate(grid.data):
-        for col, mirror in enumerate(values):
+    for row in range(grid.rows):
+        for col in range(grid.cols):
             directions: tuple[Dir, ...] = tuple()
             if row == 0 and col == 0:
                 # Top Left Corner
                 directions = (Dir.E, Dir.S)
-            elif row == (rows_len := len(grid.data) - 1) and col == 0:
+            elif row == (rows_len := grid.rows - 1) and col == 0:
                 # Bottom Left Corner
                 directions = (Dir.E, Dir.N)
-            elif row == 0 and col == (cols_len := len(grid.data[0]) - 1):
+            elif row == 0 and col == (cols_len := grid.cols - 1):
                 # Top Right Corner
                 directions = (Dir.W, Dir.S)
             elif row == rows_len and col == cols_len:
@@ -354,10 +369,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -9,7 +9,8 @@ from math import inf
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 DATA_TYPE = list[list[int]]
@@ -131,8 +132,9 @@ class LossGraph:
         heapq.heappush(queue, (start_state.heat_loss, start_state))
 
         while queue:
-            ic(heat_map)
-            ic(visited)
+            if ic.enabled:
+                ic(heat_map)
+                ic(visited)
             curr_loss, state = heapq.heappop(queue)
 
             if state.position == self.goal_coord:
@@ -143,13 +145,15 @@ class LossGraph:
                 continue
 
             visited.add(state)
-            ic(curr_loss, state)
+            if ic.enabled:
+                ic(curr_loss, state)
 
             for new_state in state.find_candidates(self.data):
                 if heat_map.get(new_state, inf) <= new_state.heat_loss:
                     continue
 
-                ic(new_state)
+                if ic.enabled:
+                    ic(new_state)
 
                 heat_map[new_state] = new_state.heat_loss
                 heapq.heappush(queue, (new_state.heat_loss, new_state))
@@ -178,10 +182,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main()
+    run(main)
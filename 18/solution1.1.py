@@ -1,11 +1,13 @@
 import argparse
 import re
+import sys
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 INPUT_RE = re.compile(r"(?P<direction>[UDLR]) (?P<count>\d+) \(#(?P<color>[0-9a-z]+)\)")
@@ -68,8 +70,9 @@ class Trench:
             case Direction.R:
                 c += 1
 
-        ic(self.vertices[-1])
-        ic(Coordinate(r * count, c * count))
+        if ic.enabled:
+            ic(self.vertices[-1])
+            ic(Coordinate(r * count, c * count))
         self.vertices.append(self.vertices[-1] + Coordinate(r * count, c * count))
         self.perimeter += count
 
@@ -104,7 +107,8 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
     trench = Trench()
     for instruction in instructions:
-        ic(instruction)
+        if ic.enabled:
+            ic(instruction)
         trench.process(instruction)
 
     area = trench.find_area()
@@ -117,10 +121,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main(["input"])
+    run(main, sys.argv[1:] or ["input"])
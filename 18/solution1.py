@@ -1,5 +1,6 @@
 import argparse
 import re
+import sys
 from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
@@ -7,7 +8,9 @@ from pathlib import Path
 from typing import Optional, Sequence
 
 from extra.convert_hex_xterm import rgb2short
-from icecream import ic
+
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 INPUT_RE = re.compile(r"(?P<direction>[UDLR]) (?P<count>\d+) \(#(?P<color>[0-9a-z]+)\)")
@@ -191,7 +194,8 @@ def main(args: Optional[Sequence[str]] = None) -> None:
 
     trench = Trench()
     for instruction in instructions:
-        ic(instruction)
+        if ic.enabled:
+            ic(instruction)
         trench.process(instruction)
 
     o = trench.to_console()
@@ -205,10 +209,10 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    main(["testinput1", "-q"])
+    run(main, sys.argv[1:] or ["testinput1", "-q"])
@@ -0,0 +1,51 @@
+import random
+from string import ascii_lowercase
+
+
+WORKFLOWS = 500
+PARTS = 200
+MAX_RULES = 3
+CHILD_CHANCE = 0.55
+
+
+def _name(idx: int) -> str:
+    name = ""
+    idx += len(ascii_lowercase)
+    while idx:
+        idx, r = divmod(idx, len(ascii_lowercase))
+        name = ascii_lowercase[r] + name
+    return name
+
+
+def generate(scale: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    names = (x for x in map(_name, range(WORKFLOWS * scale * 2)) if x != "in")
+    budget = WORKFLOWS * scale - 1
+
+    # Grow a tree out from `in`, every workflow is referenced exactly once
+    workflows: list[str] = []
+    queue = ["in"]
+    while queue:
+        name = queue.pop()
+        targets: list[str] = []
+        for _ in range(rng.randint(1, MAX_RULES) + 1):
+            if budget and rng.random() < CHILD_CHANCE:
+                budget -= 1
+                targets.append(child := next(names))
+                queue.append(child)
+            else:
+                targets.append(rng.choice("AR"))
+
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+            for target in targets[:-1]
+        ]
+        workflows.append(f"{name}{{{','.join(rules)},{targets[-1]}}}")
+
+    parts = [
+        f"{{x={rng.randint(1, 4000)},m={rng.randint(1, 4000)},"
+        f"a={rng.randint(1, 4000)},s={rng.randint(1, 4000)}}}"
+        for _ in range(PARTS * scale)
+    ]
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts) + "\n"
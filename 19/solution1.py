@@ -1,11 +1,13 @@
 import argparse
 import re
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 @dataclass
@@ -203,11 +205,15 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    assert main(["testinput1", "-q"]) == 19114
-    assert main(["input", "-q"]) == 472630
+    if len(sys.argv) > 1:
+        run(main)
+    else:
+        # Check the known answers
+        assert run(main, ["testinput1", "-q"]) == 19114
+        assert run(main, ["input", "-q"]) == 472630
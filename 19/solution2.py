@@ -1,12 +1,14 @@
 import argparse
 import re
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from math import prod
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 
 @dataclass
@@ -45,7 +47,8 @@ class Part:
         return NotImplemented
 
     def distinct_combos(self) -> int:
-        ic(self)
+        if ic.enabled:
+            ic(self)
         return prod([self.x, self.m, self.a, self.s])
 
     def __str__(self) -> str:
@@ -158,18 +161,22 @@ class System:
         for rule_chain in flat_chains:
             min_part = Part(max_value, max_value, max_value, max_value)
             max_part = Part(0, 0, 0, 0)
-            ic(rule_chain)
+            if ic.enabled:
+                ic(rule_chain)
 
             for rule in rule_chain:
-                ic(rule)
+                if ic.enabled:
+                    ic(rule)
                 if hasattr(rule, "check"):
                     if "<" in rule.check:
                         rule.apply(min_part)
                     else:
                         rule.apply(max_part)
-            ic(min_part, max_part)
+            if ic.enabled:
+                ic(min_part, max_part)
             product = (max_part - min_part).distinct_combos()
-            ic(product)
+            if ic.enabled:
+                ic(product)
             combo_counts.append(product)
         return sum(combo_counts)
 
@@ -305,11 +312,15 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    assert main(["testinput1", "-q"]) == 167409079868000
-    assert main(["input", "-q"]) == 116738260946855
+    if len(sys.argv) > 1:
+        run(main)
+    else:
+        # Check the known answers
+        assert run(main, ["testinput1", "-q"]) == 167409079868000
+        assert run(main, ["input", "-q"]) == 116738260946855
@@ -0,0 +1,55 @@
+import random
+from string import ascii_lowercase
+
+
+COUNTERS = 4
+BITS = 12
+RESERVED = {"rx", "broadcaster"}
+
+
+def _name(idx: int) -> str:
+    name = ""
+    idx += len(ascii_lowercase) ** 2
+    while idx:
+        idx, r = divmod(idx, len(ascii_lowercase))
+        name = ascii_lowercase[r] + name
+    return name
+
+
+def _is_prime(n: int) -> bool:
+    return n > 1 and all(n % x for x in range(2, int(n**0.5) + 1))
+
+
+def generate(scale: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    names = (x for x in map(_name, range(1_000_000)) if x not in RESERVED)
+    # Counters cycle on a 12 bit prime so that their LCM is the answer to part 2
+    periods = [x for x in range(2 ** (BITS - 1) + 1, 2**BITS, 2) if _is_prime(x)]
+
+    lines: list[str] = []
+    final = next(names)
+    starts: list[str] = []
+    for _ in range(COUNTERS * scale):
+        period = rng.choice(periods)
+        flip_flops = [next(names) for _ in range(BITS)]
+        hub = next(names)
+        inverter = next(names)
+        starts.append(flip_flops[0])
+
+        # A chain of flip flops counting presses, the bits set in the period feed
+        # the hub which fires and resets the chain once the count reaches it
+        for bit, name in enumerate(flip_flops):
+            outputs = flip_flops[bit + 1 : bit + 2]
+            if period >> bit & 1:
+                outputs.append(hub)
+            lines.append(f"%{name} -> {', '.join(outputs)}")
+
+        resets = [x for bit, x in enumerate(flip_flops) if not period >> bit & 1]
+        lines.append(f"&{hub} -> {', '.join([flip_flops[0], *resets, inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+
+    lines.append(f"&{final} -> rx")
+    lines.append(f"broadcaster -> {', '.join(starts)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,6 @@
 import argparse
 import re
+import sys
 import time
 from copy import deepcopy
 from dataclasses import dataclass
@@ -8,7 +9,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
-from icecream import ic
+from aoc.cli import add_common_args, run
+from aoc.trace import ic
 
 INPUT_RE = re.compile(r"((?P<type>[%&]?)(?P<name>[a-z]+)) -> (?P<outputs>(?:[a-z]+(?:, )?)+)")
 
@@ -148,14 +150,17 @@ class Machine():
                 else:
                     low_count += 1
 
-                ic(packet)
+                if ic.enabled:
+                    ic(packet)
                 self.stack.extend(self.modules[packet.recipient].pulse(packet))
-            ic(high_count, low_count)
+            if ic.enabled:
+                ic(high_count, low_count)
             total_high_count += high_count
             total_low_count += low_count
             loops += 1
 
-            ic(loops, total_high_count, total_low_count)
+            if ic.enabled:
+                ic(loops, total_high_count, total_low_count)
             if self.module_hash == self.hash_modules():
                 loop_mult = int(1000 / loops)
                 return ((total_high_count * loop_mult) * (total_low_count * loop_mult))
@@ -203,20 +208,24 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
 
     parser.add_argument("input_path", type=lambda p: Path(p).absolute())
 
-    parser.add_argument("-q", "--quiet", action="store_true")
+    add_common_args(parser)
 
     return parser.parse_args(args)
 
 
 if __name__ == "__main__":
-    start = time.monotonic()
-    assert main(['testinput1', '-q']) == 32_000_000
-    print(f"testinput1: {timedelta(seconds=time.monotonic() - start)}")
-
-    start = time.monotonic()
-    assert main(['testinput2', '-q']) == 11_687_500
-    print(f"testinput2: {timedelta(seconds=time.monotonic() - start)}")
-
-    start = time.monotonic()
-    assert main(['input', '-q']) == 825896364
-    print(f"input: {timedelta(seconds=time.monotonic() - start)}")
+    if len(sys.argv) > 1:
+        run(main)
+    else:
+        # Check the known answers
+        start = time.monotonic()
+        assert run(main, ['testinput1', '-q']) == 32_000_000
+        print(f"testinput1: {timedelta(seconds=time.monotonic() - start)}")
+
+        start = time.monotonic()
+        assert run(main, ['testinput2', '-q']) == 11_687_500
+        print(f"testinput2: {timedelta(seconds=time.monotonic() - start)}")
+
+        start = time.monotonic()
+        assert run(main, ['input', '-q']) == 825896364
+        print(f"input: {timedelta(seconds=time.monotonic() - start)}")
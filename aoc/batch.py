@@ -0,0 +1,93 @@
+import contextlib
+import glob
+import io
+import multiprocessing as mp
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from aoc.cli import GLOB_CHARS
+from aoc.solutions import answer
+
+
+SKIP_SUFFIXES = {".aocp", ".tmp"}
+
+
+def expand_inputs(specs: Sequence[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into a list of input files."""
+    paths: list[Path] = []
+    for spec in specs:
+        if GLOB_CHARS & set(spec):
+            candidates = [Path(x) for x in sorted(glob.glob(spec))]
+        elif Path(spec).is_dir():
+            candidates = sorted(Path(spec).iterdir())
+        else:
+            candidates = [Path(spec)]
+
+        paths.extend(
+            p.absolute()
+            for p in candidates
+            if p.is_file()
+            and not p.name.startswith(".")
+            and p.suffix not in SKIP_SUFFIXES
+        )
+    return paths
+
+
+def run_one(main: Callable, args: Sequence[str]) -> tuple[Any, float, str]:
+    # Output is captured so concurrent inputs don't interleave, only the answer
+    # is reported back, along with the debug output if the input failed. Argparse
+    # errors are SystemExit, so everything is caught here rather than in the pool
+    output = io.StringIO()
+    debug = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(debug):
+            result = main(list(args))
+    except BaseException as e:
+        wall = time.perf_counter() - start
+        return e, wall, debug.getvalue()
+
+    result = answer(result, output.getvalue(), debug.getvalue())
+    return result, time.perf_counter() - start, ""
+
+
+def run_batch(
+    main: Callable, inputs: Sequence[Path], args: Sequence[str], jobs: int
+) -> dict[Path, Any]:
+    """
+    Run `main` once per input in a pool, printing a line per input as it finishes.
+    """
+    results: dict[Path, Any] = {}
+    if not inputs:
+        print("No inputs found", file=sys.stderr)
+        return results
+
+    # Forked workers inherit the already imported solution, so there is no
+    # interpreter startup or import cost per input
+    context = mp.get_context("fork")
+    with ProcessPoolExecutor(min(jobs, len(inputs)), mp_context=context) as pool:
+        futures = {
+            pool.submit(run_one, main, [str(path), *args]): path for path in inputs
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result, wall, debug = future.result()
+            except Exception as e:
+                result, debug = e, ""
+
+            if isinstance(result, BaseException):
+                print(
+                    f"{path}: FAILED {type(result).__name__}: {result}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+                if debug:
+                    print(debug.rstrip(), file=sys.stderr, flush=True)
+            else:
+                print(f"{path}: {result} ({wall:.3f}s)", flush=True)
+            results[path] = result
+    return results
@@ -0,0 +1,252 @@
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from aoc.generate import generated_input
+from aoc.runner import make_pool
+from aoc.solutions import (
+    ROOT,
+    Solution,
+    day_context,
+    execute,
+    find_solutions,
+    load_module,
+    unload_modules,
+)
+
+
+DEFAULT_BASELINE = ROOT / "benchmarks.json"
+SCALE_RE = re.compile(r"^input(?:\.x(?P<scale>\d+)\.s\d+)?$")
+
+
+@dataclass
+class Benchmark:
+    solution: str
+    input_name: str
+    samples: list[float] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.solution}:{self.input_name}"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "median": self.median,
+            "min": min(self.samples),
+            "max": max(self.samples),
+            "stdev": statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0,
+            "samples": len(self.samples),
+            "result": str(self.result),
+        }
+
+
+def fresh_import(solution: Solution) -> None:
+    # Module level @caches would otherwise stay warm from one sample to the next,
+    # so each sample gets the solution imported again. That happens before the
+    # clock starts, as the import isn't what is being measured
+    unload_modules(solution)
+    if solution.has_main:
+        with day_context(solution):
+            load_module(solution)
+
+
+def benchmark_solution(
+    solution: Solution, input_path: Path, warmup: int, repeat: int
+) -> Benchmark:
+    bench = Benchmark(solution.id, input_path.name)
+    try:
+        for _ in range(warmup):
+            fresh_import(solution)
+            execute(solution, input_path)
+
+        for _ in range(repeat):
+            fresh_import(solution)
+            start = time.perf_counter()
+            bench.result, _ = execute(solution, input_path)
+            bench.samples.append(time.perf_counter() - start)
+    except BaseException as e:
+        bench.error = f"{type(e).__name__}: {e}"
+    return bench
+
+
+def run_benchmarks(
+    cases: Sequence[tuple[Solution, Path]], warmup: int, repeat: int
+) -> list[Benchmark]:
+    benchmarks = []
+    # One case at a time so solutions don't compete for the CPU, but every case
+    # still gets a fresh worker process.
+    with make_pool(1) as pool:
+        for solution, input_path in cases:
+            bench = pool.submit(
+                benchmark_solution, solution, input_path, warmup, repeat
+            ).result()
+            status = f"{bench.median:.4f}s" if bench.error is None else bench.error
+            print(f"{bench.key}: {status}", file=sys.stderr)
+            benchmarks.append(bench)
+    return benchmarks
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.is_file():
+        return {}
+    with path.open() as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, benchmarks: Sequence[Benchmark]) -> None:
+    baseline = load_baseline(path)
+    baseline.update({b.key: b.summary() for b in benchmarks if b.error is None})
+    with path.open("w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def compare(
+    benchmarks: Sequence[Benchmark],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for bench in benchmarks:
+        if bench.error is not None:
+            regressions.append(f"{bench.key}: {bench.error}")
+            continue
+
+        if (previous := baseline.get(bench.key)) is None:
+            print(f"{bench.key}: {bench.median:.4f}s (no baseline)")
+            continue
+
+        ratio = bench.median / previous["median"]
+        line = (
+            f"{bench.key}: {previous['median']:.4f}s -> {bench.median:.4f}s "
+            f"({ratio:.2f}x)"
+        )
+        print(line)
+        if ratio > 1 + threshold:
+            regressions.append(line)
+    return regressions
+
+
+def format_scaling(benchmarks: Sequence[Benchmark]) -> str:
+    # Median per scale of the real input, and how much slower each step got
+    by_solution: dict[str, dict[int, float]] = {}
+    for bench in benchmarks:
+        if bench.error is None and (match := SCALE_RE.match(bench.input_name)):
+            scales = by_solution.setdefault(bench.solution, {})
+            scales[int(match.group("scale") or 1)] = bench.median
+
+    lines = []
+    for solution, scales in by_solution.items():
+        steps = []
+        previous = None
+        for scale, median in sorted(scales.items()):
+            growth = (
+                f" ({median / previous[1]:.1f}x for {scale // previous[0]}x)"
+                if previous
+                else ""
+            )
+            steps.append(f"x{scale} {median:.4f}s{growth}")
+            previous = (scale, median)
+        lines.append(f"{solution}: {', '.join(steps)}")
+    return "\n".join(lines)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
+
+    solutions = [
+        solution
+        for solution in find_solutions(pargs.root, pargs.selectors)
+        if not any(solution.matches(x) for x in pargs.exclude)
+    ]
+
+    cases = [
+        (solution, input_path)
+        for solution in solutions
+        for input_path in solution.inputs()
+        if (not pargs.input or input_path.name in pargs.input)
+        and (solution.has_main or input_path.name == "input")
+    ]
+    for scale in pargs.scale:
+        for solution in filter(lambda s: s.has_main, solutions):
+            if (input_path := generated_input(solution.directory, scale)) is not None:
+                cases.append((solution, input_path))
+
+    benchmarks = run_benchmarks(cases, pargs.warmup, pargs.repeat)
+
+    if pargs.scale:
+        print(format_scaling(benchmarks))
+
+    if pargs.save:
+        save_baseline(pargs.baseline, benchmarks)
+        print(f"Saved {len(benchmarks)} benchmarks to {pargs.baseline}")
+        return 0
+
+    regressions = compare(benchmarks, load_baseline(pargs.baseline), pargs.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {pargs.threshold:.0%}:")
+        print("\n".join(regressions))
+        return 1
+    return 0
+
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark solutions against stored baselines"
+    )
+
+    parser.add_argument(
+        "selectors",
+        nargs="*",
+        help="Days (eg: 12) or solutions (eg: 12/solution2.1) to run",
+    )
+
+    parser.add_argument("-x", "--exclude", action="append", default=[])
+    parser.add_argument(
+        "-i",
+        "--input",
+        action="append",
+        help="Only benchmark these input names (default: all)",
+    )
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=int,
+        action="append",
+        default=[],
+        help="Also run generated inputs this many times the size of the real one",
+    )
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown of the median",
+    )
+    parser.add_argument(
+        "--baseline", type=lambda p: Path(p).absolute(), default=DEFAULT_BASELINE
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Store results as the new baseline"
+    )
+    parser.add_argument("--root", type=lambda p: Path(p).absolute(), default=ROOT)
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+from functools import cache
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from aoc.solutions import ROOT, Solution
+
+
+CACHE_DIR = ROOT / ".aoc_cache"
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@cache
+def source_digest(directory: Path) -> str:
+    """Digest of every Python source under directory, by relative path."""
+    digest = hashlib.sha256()
+    for path in sorted(directory.rglob("*.py")):
+        digest.update(str(path.relative_to(directory)).encode())
+        digest.update(file_digest(path).encode())
+    return digest.hexdigest()
+
+
+def cache_key(solution: Solution, input_path: Path, args: Sequence[str] = ()) -> str:
+    # The solution's day directory covers the solution itself and any helpers it
+    # imports from there (eg: 18/extra), and aoc covers everything else it can use
+    key = hashlib.sha256()
+    key.update(solution.id.encode())
+    key.update(source_digest(solution.directory).encode())
+    key.update(source_digest(Path(__file__).parent).encode())
+    key.update(file_digest(input_path).encode())
+    key.update(json.dumps(list(args)).encode())
+    return key.hexdigest()
+
+
+class ResultCache:
+    """Results of solution runs, stored on disk by the content of what was run."""
+
+    def __init__(self, directory: Path = CACHE_DIR / "results"):
+        self.directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        try:
+            with self._path(key).open() as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename so concurrent runs never see a partial entry
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w") as f:
+            json.dump(entry, f, default=str)
+        tmp.replace(path)
@@ -0,0 +1,92 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from aoc.profiling import add_profile_args, profile, trace_allocations
+
+
+GLOB_CHARS = set("*?[")
+
+
+def add_common_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "more_inputs",
+        nargs="*",
+        metavar="input_path",
+        help="Further inputs, directories or globs to run as a batch",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Turn off all trace output"
+    )
+    add_profile_args(parser)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes when given several inputs, a directory or a glob",
+    )
+
+
+def split_inputs(
+    parse_args: Callable[[Sequence[str]], argparse.Namespace], args: list[str]
+) -> tuple[argparse.Namespace, list[str], list[str]]:
+    """
+    Parse `args` with the solution's own parser, and split them into the inputs it
+    found and everything else, so option values that happen to name paths are
+    never taken for inputs.
+    """
+    pargs = parse_args(args)
+    more = pargs.more_inputs
+    specs = [str(pargs.input_path), *more]
+
+    # The inputs are one run of arguments, but the first has already been made
+    # absolute. Swapping a placeholder in for them and getting the same options
+    # back rules out option values which name the same path
+    placeholder = f"input-{os.getpid()}"
+    expected = vars(pargs) | {
+        "input_path": Path(placeholder).absolute(),
+        "more_inputs": [],
+    }
+    for idx, arg in enumerate(args):
+        end = idx + 1 + len(more)
+        if args[idx + 1 : end] != more or Path(arg).absolute() != pargs.input_path:
+            continue
+
+        rest = args[:idx] + args[end:]
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                swapped = parse_args(args[:idx] + [placeholder] + args[end:])
+        except SystemExit:
+            continue
+        if vars(swapped) == expected:
+            return pargs, specs, rest
+
+    raise ValueError(f"Couldn't find the inputs in {args}")
+
+
+def run(main: Callable, args: Optional[Sequence[str]] = None) -> Any:
+    """Entry point for solutions.
+
+    Runs `main` once, or once per input in a worker pool when given several inputs,
+    optionally under a profiler.
+    """
+    args = list(sys.argv[1:] if args is None else args)
+
+    module = sys.modules[main.__module__]
+    pargs, specs, others = split_inputs(module.parse_args, args)
+    if len(specs) > 1 or Path(specs[0]).is_dir() or GLOB_CHARS & set(specs[0]):
+        # Only pay for the pool and its imports when there is a batch to run
+        from aoc.batch import expand_inputs, run_batch
+
+        return run_batch(main, expand_inputs(specs), others, pargs.jobs)
+
+    if pargs.profile:
+        return profile(main, args, Path(getattr(module, "__file__", "main")).stem)
+    if pargs.tracemalloc:
+        return trace_allocations(main, args)
+    return main(args)
@@ -0,0 +1,77 @@
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Optional, Sequence
+
+from aoc.cache import CACHE_DIR
+from aoc.solutions import ROOT
+
+
+GENERATED_DIR = CACHE_DIR / "generated"
+SCALES = (10, 100, 1000)
+
+
+def load_generator(day_dir: Path) -> Optional[ModuleType]:
+    path = day_dir / "generate.py"
+    if not path.is_file():
+        return None
+
+    spec = importlib.util.spec_from_file_location(f"aoc_{day_dir.name}_generate", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generated_input(day_dir: Path, scale: int, seed: int = 0) -> Optional[Path]:
+    """Path to a generated input `scale` times the size of the real one.
+
+    Inputs are deterministic for a given seed and only generated once.
+    """
+    if (generator := load_generator(day_dir)) is None:
+        return None
+
+    path = GENERATED_DIR / day_dir.name / f"input.x{scale}.s{seed}"
+    if not path.is_file():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(generator.generate(scale, seed))
+        tmp.replace(path)
+    return path
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
+
+    day_dir = pargs.root / pargs.day
+    if (generator := load_generator(day_dir)) is None:
+        print(f"Day {pargs.day} has no generate.py", file=sys.stderr)
+        return 1
+
+    output = generator.generate(pargs.scale, pargs.seed)
+    if pargs.output:
+        pargs.output.write_text(output)
+    else:
+        sys.stdout.write(output)
+    return 0
+
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate large synthetic inputs for a day"
+    )
+
+    parser.add_argument("day", help="Day directory, eg: 16")
+
+    parser.add_argument("-s", "--scale", type=int, default=SCALES[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=lambda p: Path(p).absolute())
+    parser.add_argument("--root", type=lambda p: Path(p).absolute(), default=ROOT)
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
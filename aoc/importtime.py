@@ -0,0 +1,116 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+from aoc.solutions import ROOT, Solution, find_solutions
+
+
+MARKER = "--aoc-importtime--"
+IMPORTTIME_RE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| "
+    r"(?P<indent>\s*)(?P<name>\S+)$"
+)
+
+# Import the solution the way aoc.solutions does, without running main()
+LOADER = f"""
+import importlib.util, sys
+sys.stderr.write("{MARKER}\\n")
+spec = importlib.util.spec_from_file_location("solution", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+sys.modules["solution"] = module
+spec.loader.exec_module(module)
+"""
+
+
+@dataclass
+class ImportTime:
+    solution: str
+    # Microseconds spent importing the solution's dependencies
+    imports: list[int] = field(default_factory=list)
+    # Seconds for the whole interpreter, startup included
+    process: list[float] = field(default_factory=list)
+    heaviest: list[tuple[str, int]] = field(default_factory=list)
+
+
+def parse_importtime(stderr: str) -> tuple[int, list[tuple[str, int]]]:
+    # Only look at what the solution imported, not interpreter startup
+    _, _, stderr = stderr.partition(MARKER)
+
+    total = 0
+    top_level = []
+    for line in stderr.splitlines():
+        if not (match := IMPORTTIME_RE.match(line)):
+            continue
+        if not match.group("indent"):
+            cumulative = int(match.group("cumulative"))
+            total += cumulative
+            top_level.append((match.group("name"), cumulative))
+    return total, sorted(top_level, key=lambda x: x[1], reverse=True)
+
+
+def measure(solution: Solution, repeat: int) -> ImportTime:
+    result = ImportTime(solution.id)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", LOADER, str(solution.path)],
+            cwd=solution.directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result.process.append(time.perf_counter() - start)
+
+        total, heaviest = parse_importtime(proc.stderr)
+        result.imports.append(total)
+        result.heaviest = heaviest
+    return result
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
+
+    # Older days run everything at import time, so there's nothing to measure
+    solutions = [s for s in find_solutions(pargs.root, pargs.selectors) if s.has_main]
+
+    print(
+        f"{'solution':<16}  {'imports (ms)':>12}  {'process (ms)':>12}  "
+        "heaviest imports"
+    )
+    for solution in solutions:
+        result = measure(solution, pargs.repeat)
+        heaviest = ", ".join(
+            f"{name} {us / 1000:.1f}" for name, us in result.heaviest[: pargs.top]
+        )
+        print(
+            f"{result.solution:<16}  "
+            f"{statistics.median(result.imports) / 1000:>12.1f}  "
+            f"{statistics.median(result.process) * 1000:>12.1f}  {heaviest}"
+        )
+    return 0
+
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure import time of each solution")
+
+    parser.add_argument(
+        "selectors",
+        nargs="*",
+        help="Days (eg: 12) or solutions (eg: 12/solution2.1) to measure",
+    )
+
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=3, help="Heaviest imports to show")
+    parser.add_argument("--root", type=lambda p: Path(p).absolute(), default=ROOT)
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+MISSING = object()
+POLICIES = ("lru", "fifo", "none")
+
+
+class Cache(object):
+    """
+    In memory memoisation with hit/miss counts. `get` returns MISSING rather than
+    raising, so a cached None is still a hit.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        self.misses += 1
+        return MISSING
+
+    def put(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"{type(self).__name__}<size={len(self)}/{self.maxsize}, "
+            f"hits={self.hits}, misses={self.misses}, rate={rate:.1%}>"
+        )
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class NoCache(Cache):
+    """Never stores anything, every lookup is a miss."""
+
+
+class FIFOCache(Cache):
+    """Once full, the oldest entry is dropped to make room, however often it is used."""
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            # Nothing could ever be stored, use NoCache (the "none" policy) instead
+            raise ValueError(f"Cache size must be at least 1, got {maxsize}")
+        super().__init__(maxsize)
+        self.data: dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable) -> Any:
+        value = self.data.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if key not in self.data and len(self.data) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the oldest
+            del self.data[next(iter(self.data))]
+        self.data[key] = value
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class LRUCache(FIFOCache):
+    """Once full, the least recently used entry is dropped to make room."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        value = super().get(key)
+        if value is not MISSING:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+def make_cache(policy: str = "lru", maxsize: int = 2**16) -> Cache:
+    match policy:
+        case "lru":
+            return LRUCache(maxsize)
+        case "fifo":
+            return FIFOCache(maxsize)
+        case "none":
+            return NoCache()
+
+    raise ValueError(f"Unknown cache policy: {policy} (expected one of {POLICIES})")
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Callable
+
+
+MAGIC = b"AOCP"
+VERSION = 1
+ALIGN = 8
+HEADER_LEN = struct.Struct("<I")
+
+Arrays = dict[str, array]
+Views = dict[str, memoryview]
+
+
+def cache_path(input_path: Path, name: str) -> Path:
+    return input_path.with_name(f"{input_path.name}.{name}.aocp")
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write(path: Path, digest: str, arrays: Arrays) -> None:
+    # Layout: MAGIC, header length, JSON header, then each array's raw bytes
+    # aligned to 8 so they can be cast straight out of the mmap
+    entries: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for key, values in arrays.items():
+        entries[key] = {
+            "typecode": values.typecode,
+            "offset": offset,
+            "length": len(values),
+        }
+        offset = _align(offset + len(values) * values.itemsize)
+
+    header = json.dumps(
+        {"version": VERSION, "sha256": digest, "arrays": entries}
+    ).encode()
+    start = _align(len(MAGIC) + HEADER_LEN.size + len(header))
+
+    # Per process, so concurrent writers never share a half written file
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC + HEADER_LEN.pack(len(header)) + header)
+        for key, values in arrays.items():
+            f.seek(start + entries[key]["offset"])
+            values.tofile(f)
+        f.truncate(start + offset)
+    tmp.replace(path)
+
+
+def read(path: Path, digest: str) -> Views | None:
+    try:
+        with path.open("rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    # Anything that doesn't parse, eg: a file truncated by a crash or written by
+    # an older layout, is just a miss and gets rewritten
+    try:
+        if mm[: len(MAGIC)] != MAGIC:
+            return None
+
+        (header_len,) = HEADER_LEN.unpack_from(mm, len(MAGIC))
+        header_start = len(MAGIC) + HEADER_LEN.size
+        header = json.loads(mm[header_start : header_start + header_len])
+        if header["version"] != VERSION or header["sha256"] != digest:
+            return None
+
+        start = _align(header_start + header_len)
+        data = memoryview(mm)
+        views = {}
+        for key, entry in header["arrays"].items():
+            itemsize = array(entry["typecode"]).itemsize
+            offset = start + entry["offset"]
+            stop = offset + entry["length"] * itemsize
+            if stop > len(mm):
+                return None
+            views[key] = data[offset:stop].cast(entry["typecode"])
+    except (struct.error, ValueError, KeyError, TypeError):
+        return None
+    return views
+
+
+def load(input_path: Path, name: str, parse: Callable[[Path], Arrays]) -> Views:
+    """Parsed arrays for `input_path`, memory mapped from the cache next to it.
+
+    The cache is keyed on the input's hash, `parse` only runs when that changes.
+    """
+    digest = hashlib.sha256(input_path.read_bytes()).hexdigest()
+    path = cache_path(input_path, name)
+
+    if (views := read(path, digest)) is not None:
+        return views
+
+    arrays = parse(input_path)
+    try:
+        write(path, digest, arrays)
+    except OSError:
+        # Read only checkouts still work, they just parse every time
+        pass
+    return {key: memoryview(values) for key, values in arrays.items()}
+
+
+def parse_grid(input_path: Path) -> Arrays:
+    """A rectangular text grid as one flat byte per cell plus its shape."""
+    with input_path.open("rb") as f:
+        rows = [line.strip() for line in f if line.strip()]
+    return {
+        "cells": array("B", b"".join(rows)),
+        "shape": array("q", [len(rows), len(rows[0]) if rows else 0]),
+    }
@@ -0,0 +1,106 @@
+import argparse
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+
+TOP_ALLOCATIONS = 10
+TOP_FUNCTIONS = 20
+
+Func = tuple[str, int, str]
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile, writing <solution>.pstats and <solution>.folded",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help=f"Report the top {TOP_ALLOCATIONS} allocation sites",
+    )
+
+
+def _label(func: Func) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Builtins, eg: <built-in method builtins.sorted>
+        return name
+    return f"{name} ({Path(filename).name}:{lineno})"
+
+
+def collapse_stacks(stats: dict) -> dict[str, int]:
+    """Rebuild collapsed stacks (in microseconds) from cProfile's caller graph.
+
+    cProfile only records caller -> callee edges, so time in a function called from
+    several places is split between its stacks in proportion to each edge.
+    """
+    callees: dict[Func, dict[Func, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, edge_ct) in callers.items():
+            callees[caller][func] = edge_ct
+
+    folded: dict[str, float] = defaultdict(float)
+
+    def walk(func: Func, stack: list[str], seen: set[Func], share: float) -> None:
+        _, _, tt, _, _ = stats[func]
+        stack = stack + [_label(func)]
+        folded[";".join(stack)] += tt * share
+
+        for callee, edge_ct in callees[func].items():
+            callee_ct = stats[callee][3]
+            if callee in seen or not callee_ct:
+                continue
+            walk(callee, stack, seen | {callee}, share * min(edge_ct / callee_ct, 1.0))
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, [], {func}, 1.0)
+
+    return {stack: round(t * 1_000_000) for stack, t in folded.items() if t > 0}
+
+
+def profile(main: Callable, args: Sequence[str], name: str) -> Any:
+    # Profilers are imported on use, every solution imports this module at startup
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(main, args)
+    finally:
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.dump_stats(f"{name}.pstats")
+
+        with open(f"{name}.folded", "w") as f:
+            stacks = collapse_stacks(stats.stats)  # type: ignore[attr-defined]
+            for stack, us in sorted(stacks.items()):
+                f.write(f"{stack} {us}\n")
+
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        print(f"Wrote {name}.pstats and {name}.folded", file=sys.stderr)
+
+
+def trace_allocations(main: Callable, args: Sequence[str]) -> Any:
+    import tracemalloc
+
+    tracemalloc.start(25)
+    try:
+        return main(args)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        print(f"Peak traced memory: {peak / 1024:.1f} KiB", file=sys.stderr)
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            print(stat, file=sys.stderr)
@@ -0,0 +1,174 @@
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from aoc.cache import ResultCache, cache_key
+from aoc.solutions import ROOT, Solution, execute, find_solutions, solution_args
+
+
+@dataclass
+class RunResult:
+    solution: str
+    input_name: str
+    result: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_rss: int = 0
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_solution(solution: Solution, input_name: str) -> RunResult:
+    run = RunResult(solution.id, input_name)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        run.result, _ = execute(solution, solution.directory / input_name)
+    except BaseException as e:
+        run.error = f"{type(e).__name__}: {e}"
+    run.wall = time.perf_counter() - wall_start
+    run.cpu = time.process_time() - cpu_start
+
+    # ru_maxrss is in kilobytes on Linux, the worker only ever runs this solution
+    run.peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return run
+
+
+def make_pool(jobs: int) -> ProcessPoolExecutor:
+    # Fork every solution off a warm server that has already paid for interpreter
+    # startup and our own imports, and give each solution a fresh process so peak
+    # RSS and module level caches are never shared between solutions.
+    context = mp.get_context("forkserver")
+    context.set_forkserver_preload(["aoc.solutions", "icecream"])
+    return ProcessPoolExecutor(jobs, mp_context=context, max_tasks_per_child=1)
+
+
+def run_all(
+    solutions: Sequence[Solution], input_name: str, jobs: int
+) -> Iterator[RunResult]:
+    """Run every solution, yielding each run as soon as it finishes."""
+    with make_pool(jobs) as pool:
+        futures = {
+            pool.submit(run_solution, solution, input_name): solution
+            for solution in solutions
+        }
+        for future in as_completed(futures):
+            solution = futures[future]
+            try:
+                run = future.result()
+            except Exception as e:
+                run = RunResult(
+                    solution.id, input_name, error=f"{type(e).__name__}: {e}"
+                )
+            print(
+                f"{'done' if run.ok else 'FAIL'}: {run.solution} ({run.wall:.3f}s)",
+                file=sys.stderr,
+            )
+            yield run
+
+
+def format_table(runs: Sequence[RunResult]) -> str:
+    header = ("solution", "input", "result", "wall (s)", "cpu (s)", "peak rss (MiB)")
+    rows = [
+        (
+            r.solution,
+            r.input_name,
+            str(r.result) if r.ok else str(r.error),
+            f"{r.wall:.3f}{' (cached)' if r.cached else ''}",
+            f"{r.cpu:.3f}",
+            f"{r.peak_rss / 1024:.1f}",
+        )
+        for r in runs
+    ]
+    widths = [max(len(str(x)) for x in column) for column in zip(header, *rows)]
+
+    lines = ["  ".join(x.ljust(w) for x, w in zip(header, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(x.ljust(w) for x, w in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
+
+    solutions = [
+        s
+        for s in find_solutions(pargs.root, pargs.selectors)
+        if not any(s.matches(x) for x in pargs.exclude)
+        and (s.directory / pargs.input).is_file()
+        and (s.has_main or pargs.input == "input")
+    ]
+
+    cache = ResultCache()
+    keys = {
+        s.id: cache_key(
+            s, s.directory / pargs.input, solution_args(s, Path(pargs.input))[1:]
+        )
+        for s in solutions
+    }
+
+    runs: list[RunResult] = []
+    if not pargs.no_cache:
+        for solution in list(solutions):
+            if (entry := cache.get(keys[solution.id])) is not None:
+                entry.update(solution=solution.id, input_name=pargs.input, cached=True)
+                runs.append(RunResult(**entry))
+                solutions.remove(solution)
+
+    start = time.perf_counter()
+    for run in run_all(solutions, pargs.input, pargs.jobs):
+        # Cache each run as it finishes, so an interrupted sweep keeps them
+        if run.ok:
+            cache.put(keys[run.solution], asdict(run))
+        runs.append(run)
+    elapsed = time.perf_counter() - start
+    runs.sort(key=lambda r: r.solution)
+
+    print(format_table(runs))
+    print(
+        f"\n{len(runs)} solutions, {sum(not r.ok for r in runs)} failed, "
+        f"{elapsed:.3f}s elapsed ({sum(r.wall for r in runs):.3f}s of solution time)"
+    )
+    return 0 if all(r.ok for r in runs) else 1
+
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run every day's solutions in a process pool"
+    )
+
+    parser.add_argument(
+        "selectors",
+        nargs="*",
+        help="Days (eg: 12) or solutions (eg: 12/solution2.1) to run",
+    )
+
+    parser.add_argument("-x", "--exclude", action="append", default=[])
+    parser.add_argument(
+        "-i", "--input", default="input", help="Input file name in each day"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rerun solutions even if their result is cached",
+    )
+    parser.add_argument("--root", type=lambda p: Path(p).absolute(), default=ROOT)
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
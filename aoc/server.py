@@ -0,0 +1,148 @@
+import argparse
+import json
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from aoc.cache import CACHE_DIR
+from aoc.solutions import (
+    ROOT,
+    Solution,
+    day_context,
+    execute,
+    find_solutions,
+    load_module,
+)
+from aoc.trace import ic
+
+
+DEFAULT_SOCKET = CACHE_DIR / "server.sock"
+
+
+class SolutionServer(socketserver.UnixStreamServer):
+    """Keeps every solution imported, so requests skip interpreter startup and
+    module level caches (eg: @cache) stay warm between runs.
+
+    Requests are handled one at a time, solutions change directory and redirect
+    stdout while they run.
+    """
+
+    def __init__(self, socket_path: Path, solutions: Sequence[Solution]):
+        self.solutions = {s.id: s for s in solutions}
+        for solution in solutions:
+            if solution.has_main:
+                with day_context(solution):
+                    load_module(solution)
+
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        socket_path.unlink(missing_ok=True)
+        super().__init__(str(socket_path), RequestHandler)
+
+    def run(self, request: dict[str, Any]) -> dict[str, Any]:
+        if (solution := self.solutions.get(request.get("solution", ""))) is None:
+            return {"error": f"Unknown solution: {request.get('solution')}"}
+
+        # Tracing is process wide and solutions only ever turn it off (some of
+        # them at import time), so every request starts from the default
+        ic.enable()
+
+        start = time.perf_counter()
+        try:
+            result, _ = execute(
+                solution, Path(request["input"]), *request.get("args", [])
+            )
+        except BaseException as e:
+            return {
+                "error": f"{type(e).__name__}: {e}",
+                "wall": time.perf_counter() - start,
+            }
+        return {"result": result, "wall": time.perf_counter() - start}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    server: SolutionServer
+
+    def handle(self) -> None:
+        # One JSON request per line, answered with one JSON response per line
+        for line in self.rfile:
+            try:
+                response = self.server.run(json.loads(line))
+            except json.JSONDecodeError as e:
+                response = {"error": f"Bad request: {e}"}
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+
+
+def request(
+    solution: str,
+    input_path: Path,
+    args: Sequence[str] = (),
+    socket_path: Path = DEFAULT_SOCKET,
+) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        payload = {
+            "solution": solution,
+            "input": str(input_path.absolute()),
+            "args": list(args),
+        }
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    pargs = parse_args(args)
+
+    if pargs.command == "serve":
+        solutions = find_solutions(pargs.root, pargs.selectors)
+        with SolutionServer(pargs.socket, solutions) as server:
+            print(
+                f"Serving {len(solutions)} solutions on {pargs.socket}", file=sys.stderr
+            )
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                pargs.socket.unlink(missing_ok=True)
+        return 0
+
+    response = request(pargs.solution, pargs.input_path, pargs.args, pargs.socket)
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 1
+    print(f"{response['result']} ({response['wall']:.4f}s)")
+    return 0
+
+
+def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Warm solution server on a Unix socket"
+    )
+    parser.add_argument(
+        "--socket", type=lambda p: Path(p).absolute(), default=DEFAULT_SOCKET
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Import solutions and wait for requests")
+    serve.add_argument(
+        "selectors", nargs="*", help="Days or solutions to load (default: all)"
+    )
+    serve.add_argument("--root", type=lambda p: Path(p).absolute(), default=ROOT)
+
+    run = commands.add_parser("run", help="Ask a running server to run a solution")
+    run.add_argument("solution", help="eg: 12/solution2.1")
+    run.add_argument("input_path", type=lambda p: Path(p).absolute())
+    run.add_argument(
+        "args", nargs=argparse.REMAINDER, help="Extra arguments for the solution"
+    )
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
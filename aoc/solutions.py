@@ -0,0 +1,162 @@
+import ast
+import contextlib
+import importlib.util
+import io
+import os
+import re
+import runpy
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator, Optional, Sequence
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DAY_RE = re.compile(r"^\d{2}$")
+SOLUTION_GLOB = "solution*.py"
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@dataclass(frozen=True)
+class Solution:
+    day: str
+    name: str
+    path: Path
+    has_main: bool
+    has_quiet: bool
+
+    @property
+    def id(self) -> str:
+        return f"{self.day}/{self.name}"
+
+    @property
+    def directory(self) -> Path:
+        return self.path.parent
+
+    def inputs(self) -> list[Path]:
+        # The real input first, followed by every testinput in name order
+        paths = [self.directory / "input"]
+        paths.extend(sorted(self.directory.glob("testinput*")))
+        return [p for p in paths if p.is_file()]
+
+    def matches(self, selector: str) -> bool:
+        # "12" selects a whole day, "12/solution2.1" a single solution
+        return selector.rstrip("/") in (self.day, self.id)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "Solution":
+        tree = ast.parse(path.read_text(), filename=str(path))
+        has_main = any(
+            isinstance(node, ast.FunctionDef) and node.name == "main"
+            for node in tree.body
+        )
+        # add_common_args brings --quiet along with it
+        has_quiet = any(
+            (isinstance(node, ast.Constant) and node.value == "--quiet")
+            or (isinstance(node, ast.Name) and node.id == "add_common_args")
+            for node in ast.walk(tree)
+        )
+        return cls(path.parent.name, path.stem, path, has_main, has_quiet)
+
+
+def find_solutions(
+    root: Path = ROOT, selectors: Optional[Sequence[str]] = None
+) -> list[Solution]:
+    solutions = []
+    for day in sorted(p for p in root.iterdir() if DAY_RE.match(p.name)):
+        for path in sorted(day.glob(SOLUTION_GLOB)):
+            solution = Solution.from_path(path)
+            if selectors and not any(solution.matches(s) for s in selectors):
+                continue
+            solutions.append(solution)
+    return solutions
+
+
+@contextlib.contextmanager
+def day_context(solution: Solution) -> Iterator[None]:
+    # Solutions open their inputs relative to the day directory and some of them
+    # import helpers next to them (eg: 18/extra), so mimic running from there.
+    cwd = os.getcwd()
+    directory = str(solution.directory)
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    try:
+        yield
+    finally:
+        sys.path.remove(directory)
+        os.chdir(cwd)
+
+
+def load_module(solution: Solution) -> ModuleType:
+    module_name = f"aoc_{solution.day}_{solution.name.replace('.', '_')}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, solution.path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def unload_modules(solution: Solution) -> None:
+    """
+    Forget the solution and anything it imported from its day directory, so they
+    are imported afresh, with cold module level caches, the next time they run.
+    """
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path is not None and Path(path).parent == solution.directory:
+            del sys.modules[name]
+
+
+def solution_args(solution: Solution, input_path: Path, *extra: str) -> list[str]:
+    args = [str(input_path), *extra]
+    if solution.has_quiet and "-q" not in extra and "--quiet" not in extra:
+        args.append("-q")
+    return args
+
+
+def answer(result: Any, output: str, debug: str) -> Any:
+    if result is not None:
+        return result
+
+    # Fall back to whatever was printed last, which is the answer by convention.
+    # Some days only ever ic() their answer, so use that if nothing was printed.
+    lines = output.splitlines() or ANSI_RE.sub("", debug).splitlines()
+    lines = [line.strip() for line in lines if line.strip()]
+    return lines[-1] if lines else None
+
+
+def execute(
+    solution: Solution, input_path: Optional[Path] = None, *extra: str
+) -> tuple[Any, str]:
+    """Run a solution in this process and return (result, captured stdout)."""
+    input_path = (input_path or solution.directory / "input").absolute()
+
+    # Debug output from icecream goes to stderr, the answer is printed to stdout
+    output = io.StringIO()
+    debug = io.StringIO()
+    with (
+        day_context(solution),
+        contextlib.redirect_stdout(output),
+        contextlib.redirect_stderr(debug),
+    ):
+        if solution.has_main:
+            module = load_module(solution)
+            result = module.main(solution_args(solution, input_path, *extra))
+        else:
+            # Older days are plain scripts hardcoded to read `input`
+            if input_path.name != "input":
+                raise ValueError(f"{solution.id} can only be run against `input`")
+            runpy.run_path(str(solution.path), run_name="__aoc__")
+            result = None
+
+    return answer(result, output.getvalue(), debug.getvalue()), output.getvalue()
@@ -0,0 +1,61 @@
+import sys
+from typing import Any, Optional
+
+
+DEBUG = 10
+QUIET = 100
+
+
+_ic: Optional[Any] = None
+
+
+def _debugger() -> Any:
+    # icecream pulls in executing, asttokens and pygments, which costs more than
+    # most days take to run, so only import it the first time something is printed
+    global _ic
+    if _ic is None:
+        from icecream import ic
+
+        _ic = ic
+    return _ic
+
+
+def _passthrough(args: tuple) -> Any:
+    # Same return value as ic() so `x = ic(y)` keeps working
+    if not args:
+        return None
+    if len(args) == 1:
+        return args[0]
+    return args
+
+
+class Tracer:
+    """A level gated drop in for icecream's `ic`.
+
+    `enabled` is a plain attribute so hot loops can skip building the arguments
+    entirely with `if ic.enabled: ic(...)`.
+    """
+
+    def __init__(self, level: int = DEBUG):
+        self.set_level(level)
+
+    def set_level(self, level: int) -> None:
+        self.level = level
+        self.enabled = level <= DEBUG
+
+    def enable(self) -> None:
+        self.set_level(DEBUG)
+
+    def disable(self) -> None:
+        self.set_level(QUIET)
+
+    def __call__(self, *args: Any) -> Any:
+        if self.enabled:
+            # The public format() reads the frame that calls it, which would be
+            # this one, so hand icecream our caller's frame instead
+            debugger = _debugger()
+            debugger.outputFunction(debugger._format(sys._getframe(1), *args))
+        return _passthrough(args)
+
+
+ic = Tracer()